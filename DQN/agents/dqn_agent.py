@@ -3,18 +3,17 @@ import torch.nn as nn
 import torch.optim as optim
 import numpy as np
 import random
-from collections import deque
 import os
 from .base_agent import BaseAgent
+from utils.telemetry import NullTelemetry
+from .replay_buffer import ReplayBuffer, PrioritizedReplayBuffer, MemmapReplayBuffer
 
 class DQNAgent(BaseAgent):
-    def __init__(self, state_size, action_size, use_replay=True, model_path="models/dqn_agent.pth"):
+    def __init__(self, state_size, action_size, use_replay=True, model_path="models/dqn_agent.pth",
+                 memory_size=2000, prioritized=False, alpha=0.6, beta=0.4, replay_dir=None,
+                 config=None):
         super().__init__(state_size, action_size)
         
-        self.use_replay = use_replay
-        self.model_path = model_path
-        self.memory = deque(maxlen=2000)
-        
         # Hyperparameters
         self.gamma = 0.95
         self.epsilon = 1.0
@@ -22,18 +21,54 @@ class DQNAgent(BaseAgent):
         self.epsilon_decay = 0.995
         self.learning_rate = 0.001
         self.batch_size = 32
+        hidden_size = 64
+        
+        # A TrainingConfig overrides the defaults above and the replay arguments
+        if config is not None:
+            self.gamma = config.gamma
+            self.epsilon = config.epsilon_start
+            self.epsilon_min = config.epsilon_min
+            self.epsilon_decay = config.epsilon_decay
+            self.learning_rate = config.learning_rate
+            self.batch_size = config.batch_size
+            hidden_size = config.hidden_size
+            memory_size = config.memory_size
+            prioritized = config.prioritized
+            alpha = config.per_alpha
+            beta = config.per_beta
+        
+        if prioritized and replay_dir is not None:
+            raise ValueError("prioritized replay has no disk-backed store, drop replay_dir")
+        
+        self.use_replay = use_replay
+        self.prioritized = prioritized
+        self.model_path = model_path
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(memory_size, state_size, alpha=alpha, beta=beta)
+        elif replay_dir is not None:
+            # Disk-backed store, reopened if it already exists
+            self.memory = MemmapReplayBuffer(replay_dir, memory_size, state_size)
+        else:
+            self.memory = ReplayBuffer(memory_size, state_size)
         
         # Model and optimizer
         from models.networks import DQN
-        self.model = DQN(state_size, action_size)
+        self.model = DQN(state_size, action_size, hidden_size)
         self.optimizer = optim.Adam(self.model.parameters(), lr=self.learning_rate)
         
+        # Phase timers, replaced by a Telemetry instance when profiling
+        self.telemetry = NullTelemetry()
+        
         # Create model directory
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
     
     def remember(self, state, action, reward, next_state, done):
         if self.use_replay:
-            self.memory.append((state, action, reward, next_state, done))
+            self.memory.push(state, action, reward, next_state, done)
+    
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        if self.use_replay:
+            self.memory.push_batch(states, actions, rewards, next_states, dones)
     
     def act(self, state):
         if np.random.random() <= self.epsilon:
@@ -44,50 +79,70 @@ class DQNAgent(BaseAgent):
             q_values = self.model(state)
         return torch.argmax(q_values).item()
     
+    def act_batch(self, states):
+        """Epsilon-greedy actions for a [N, state_size] batch of states"""
+        with torch.no_grad():
+            actions = self.model(states).argmax(dim=1)
+        explore = torch.rand(len(states)) <= self.epsilon
+        if explore.any():
+            actions[explore] = torch.randint(self.action_size, (int(explore.sum()),))
+        return actions
+    
     def replay(self, batch_size):
         if not self.use_replay or len(self.memory) < batch_size:
             return
         
-        minibatch = random.sample(self.memory, batch_size)
-        
-        for state, action, reward, next_state, done in minibatch:
-            target = reward
-            if not done:
-                next_state = next_state.unsqueeze(0)
-                with torch.no_grad():
-                    target = reward + self.gamma * torch.max(self.model(next_state)).item()
-            
-            state = state.unsqueeze(0)
-            target_f = self.model(state).detach().clone()
-            target_f[0][action] = target
-            
-            self.optimizer.zero_grad()
-            loss = nn.MSELoss()(self.model(state), target_f)
-            loss.backward()
-            self.optimizer.step()
+        if self.prioritized:
+            with self.telemetry.phase('replay_sample'):
+                batch, indices, weights = self.memory.sample(batch_size)
+            td_errors = self._update(*batch, weights=weights)
+            with self.telemetry.phase('priority_update'):
+                self.memory.update_priorities(indices, td_errors.numpy())
+        else:
+            with self.telemetry.phase('replay_sample'):
+                batch = self.memory.sample(batch_size)
+            self._update(*batch)
     
     def learn(self, state, action, reward, next_state, done):
         """Direct learning without replay"""
-        target = reward
-        if not done:
-            next_state = next_state.unsqueeze(0)
+        self._update(
+            state.unsqueeze(0),
+            torch.tensor([action], dtype=torch.long),
+            torch.tensor([reward], dtype=torch.float32),
+            next_state.unsqueeze(0),
+            torch.tensor([done], dtype=torch.float32)
+        )
+    
+    def _update(self, states, actions, rewards, next_states, dones, weights=None):
+        """Single gradient step on a batch of transitions, returns the TD errors"""
+        with self.telemetry.phase('forward_backward'):
             with torch.no_grad():
-                target = reward + self.gamma * torch.max(self.model(next_state)).item()
-        
-        state = state.unsqueeze(0)
-        target_f = self.model(state).detach().clone()
-        target_f[0][action] = target
+                next_q = self.model(next_states).max(dim=1).values
+                targets = rewards + self.gamma * next_q * (1 - dones)
+            
+            q_values = self.model(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+            td_errors = targets - q_values
+            if weights is None:
+                loss = td_errors.pow(2).mean()
+            else:
+                # Importance-sampling correction for prioritized replay
+                loss = (weights * td_errors.pow(2)).mean()
+            
+            self.optimizer.zero_grad()
+            loss.backward()
         
-        self.optimizer.zero_grad()
-        loss = nn.MSELoss()(self.model(state), target_f)
-        loss.backward()
-        self.optimizer.step()
+        with self.telemetry.phase('optimizer_step'):
+            self.optimizer.step()
+        self.telemetry.count('updates')
+        return td_errors.detach()
     
     def update_epsilon(self):
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
     
     def save_checkpoint(self):
+        # Disk-backed replay: write its position and size next to the weights
+        self.memory.flush()
         checkpoint = {
             'model_state_dict': self.model.state_dict(),
             'optimizer_state_dict': self.optimizer.state_dict(),
@@ -95,6 +150,10 @@ class DQNAgent(BaseAgent):
         }
         torch.save(checkpoint, self.model_path)
     
+    def close(self):
+        """Flush the replay store, call before exiting when using replay_dir"""
+        self.memory.flush()
+    
     def load_checkpoint(self):
         if os.path.exists(self.model_path):
             checkpoint = torch.load(self.model_path)
@@ -0,0 +1,417 @@
+import json
+import os
+import numpy as np
+import torch
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer backed by preallocated contiguous arrays"""
+
+    def __init__(self, capacity, state_size):
+        self.capacity = int(capacity)
+        self.state_size = state_size
+
+        self.states = np.zeros((self.capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(self.capacity, dtype=np.int64)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.next_states = np.zeros((self.capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(self.capacity, dtype=np.float32)
+
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        """O(1) insert, overwriting the oldest transition once full"""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Insert a batch of transitions with wrap-around, returns their slots"""
+        n = len(actions)
+        indices = (self.position + np.arange(n)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return indices
+
+    def sample_indices(self, batch_size):
+        return np.random.randint(0, self.size, size=batch_size)
+
+    def get_batch(self, indices):
+        """Batched tensors for the given indices, in the order of DQNAgent._update"""
+        return (
+            torch.from_numpy(self.states[indices]),
+            torch.from_numpy(self.actions[indices]),
+            torch.from_numpy(self.rewards[indices]),
+            torch.from_numpy(self.next_states[indices]),
+            torch.from_numpy(self.dones[indices])
+        )
+
+    def sample(self, batch_size):
+        return self.get_batch(self.sample_indices(batch_size))
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.states, self.actions, self.rewards,
+                                      self.next_states, self.dones))
+
+    def flush(self):
+        """Persist pending writes; nothing to do for in-memory buffers"""
+
+    def state_dict(self):
+        """Copy of the filled part of the buffer, safe to serialize on another thread"""
+        n = self.size
+        return {
+            'capacity': self.capacity,
+            'position': self.position,
+            'size': n,
+            'states': self.states[:n].copy(),
+            'actions': self.actions[:n].copy(),
+            'rewards': self.rewards[:n].copy(),
+            'next_states': self.next_states[:n].copy(),
+            'dones': self.dones[:n].copy()
+        }
+
+    def load_state_dict(self, state):
+        if state['capacity'] != self.capacity:
+            raise ValueError(f"Buffer capacity mismatch: checkpoint has {state['capacity']}, "
+                             f"buffer has {self.capacity}")
+        n = state['size']
+        self.states[:n] = state['states']
+        self.actions[:n] = state['actions']
+        self.rewards[:n] = state['rewards']
+        self.next_states[:n] = state['next_states']
+        self.dones[:n] = state['dones']
+        self.position = state['position']
+        self.size = n
+
+class SumTree:
+    """Array-backed sum/min segment tree over buffer slots.
+
+    Leaves live at [leaf_offset, leaf_offset + capacity); every operation
+    walks the tree level by level with vectorized NumPy calls, so a batch of
+    B lookups or updates costs O(B log n) without any per-node Python loop.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.leaf_offset = 1 << max(0, (self.capacity - 1).bit_length())
+        self.sums = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+        self.mins = np.full(2 * self.leaf_offset, np.inf, dtype=np.float64)
+
+    def total(self):
+        return self.sums[1]
+
+    def min(self):
+        return self.mins[1]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaf_offset
+        self.sums[nodes] = priorities
+        self.mins[nodes] = priorities
+
+        while self.leaf_offset > 1:
+            nodes = np.unique(nodes // 2)
+            self.sums[nodes] = self.sums[2 * nodes] + self.sums[2 * nodes + 1]
+            self.mins[nodes] = np.minimum(self.mins[2 * nodes], self.mins[2 * nodes + 1])
+            if nodes[0] == 1:
+                break
+
+    def find(self, values):
+        """Leaf indices whose prefix-sum interval contains each value"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+
+        while nodes[0] < self.leaf_offset:
+            left = 2 * nodes
+            left_sums = self.sums[left]
+            go_right = values > left_sums
+            values = np.where(go_right, values - left_sums, values)
+            nodes = np.where(go_right, left + 1, left)
+
+        return nodes - self.leaf_offset
+
+    def get(self, indices):
+        return self.sums[np.asarray(indices) + self.leaf_offset]
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Proportional prioritized replay (Schaul et al., 2016) over a SumTree"""
+
+    def __init__(self, capacity, state_size, alpha=0.6, beta=0.4, beta_increment=1e-4, eps=1e-6):
+        super().__init__(capacity, state_size)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.eps = eps
+        self.max_priority = 1.0
+        self.tree = SumTree(self.capacity)
+
+    def push(self, state, action, reward, next_state, done):
+        i = super().push(state, action, reward, next_state, done)
+        # New transitions get the highest priority seen so far
+        self.tree.update([i], self.max_priority ** self.alpha)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        indices = super().push_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, np.full(len(indices), self.max_priority ** self.alpha))
+        return indices
+
+    def sample_indices(self, batch_size):
+        # Stratified sampling: one uniform draw per equal-mass segment
+        segment = self.tree.total() / batch_size
+        values = (np.arange(batch_size) + np.random.random(batch_size)) * segment
+        return np.minimum(self.tree.find(values), self.size - 1)
+
+    def sample(self, batch_size):
+        """Returns (batch, indices, importance-sampling weights)"""
+        indices = self.sample_indices(batch_size)
+
+        # w_i = (N * P(i))^-beta normalized by max_j w_j, i.e. (p_i / p_min)^-beta
+        weights = (self.tree.get(indices) / self.tree.min()) ** -self.beta
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self.get_batch(indices), indices, torch.from_numpy(weights.astype(np.float32))
+
+    def state_dict(self):
+        state = super().state_dict()
+        state.update({
+            'tree_sums': self.tree.sums.copy(),
+            'tree_mins': self.tree.mins.copy(),
+            'max_priority': self.max_priority,
+            'beta': self.beta
+        })
+        return state
+
+    def load_state_dict(self, state):
+        super().load_state_dict(state)
+        self.tree.sums[:] = state['tree_sums']
+        self.tree.mins[:] = state['tree_mins']
+        self.max_priority = state['max_priority']
+        self.beta = state['beta']
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.eps
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(indices, priorities ** self.alpha)
+
+class SharedReplayBuffer(ReplayBuffer):
+    """ReplayBuffer whose arrays live in shared memory, for actor/learner training.
+
+    The capacity is split into one ring per writer (actor) process, so
+    writers never contend on a shared insert position. Pass the buffer to
+    torch.multiprocessing workers and call set_shard() in each writer.
+    """
+
+    _FIELDS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+    def __init__(self, capacity, state_size, num_shards):
+        if num_shards < 1:
+            raise ValueError(f"num_shards must be at least 1, got {num_shards}")
+        if int(capacity) < num_shards:
+            raise ValueError(f"capacity {capacity} is smaller than num_shards {num_shards}: "
+                             "every shard needs at least one slot")
+        self.num_shards = num_shards
+        self.shard_capacity = int(capacity) // num_shards
+        self.capacity = self.shard_capacity * num_shards
+        self.state_size = state_size
+        self.shard = 0
+
+        self._tensors = {
+            'states': torch.zeros(self.capacity, state_size),
+            'actions': torch.zeros(self.capacity, dtype=torch.int64),
+            'rewards': torch.zeros(self.capacity),
+            'next_states': torch.zeros(self.capacity, state_size),
+            'dones': torch.zeros(self.capacity),
+            'positions': torch.zeros(num_shards, dtype=torch.int64),
+            'sizes': torch.zeros(num_shards, dtype=torch.int64)
+        }
+        for tensor in self._tensors.values():
+            tensor.share_memory_()
+        self._bind()
+
+    def _bind(self):
+        # NumPy views over the shared tensors, so the base class methods apply
+        for name in self._FIELDS:
+            setattr(self, name, self._tensors[name].numpy())
+        self.positions = self._tensors['positions'].numpy()
+        self.sizes = self._tensors['sizes'].numpy()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._FIELDS + ('positions', 'sizes'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind()
+
+    def set_shard(self, shard):
+        self.shard = shard
+
+    def __len__(self):
+        return int(self.sizes.sum())
+
+    def push(self, state, action, reward, next_state, done):
+        k = self.shard
+        pos = int(self.positions[k])
+        i = k * self.shard_capacity + pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        # Publish the size only once the slot is fully written
+        self.positions[k] = (pos + 1) % self.shard_capacity
+        self.sizes[k] = min(self.sizes[k] + 1, self.shard_capacity)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        k = self.shard
+        n = len(actions)
+        pos = int(self.positions[k])
+        indices = k * self.shard_capacity + (pos + np.arange(n)) % self.shard_capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+
+        self.positions[k] = (pos + n) % self.shard_capacity
+        self.sizes[k] = min(self.sizes[k] + n, self.shard_capacity)
+        return indices
+
+    def sample_indices(self, batch_size):
+        # Uniform over all filled slots: pick shards by fill level, then offsets
+        sizes = self.sizes.copy()
+        shards = np.random.choice(self.num_shards, size=batch_size, p=sizes / sizes.sum())
+        offsets = (np.random.random(batch_size) * sizes[shards]).astype(np.int64)
+        return shards * self.shard_capacity + offsets
+
+    def state_dict(self):
+        state = {name: getattr(self, name).copy() for name in self._FIELDS}
+        state.update({
+            'capacity': self.capacity,
+            'positions': self.positions.copy(),
+            'sizes': self.sizes.copy()
+        })
+        return state
+
+    def load_state_dict(self, state):
+        if state['capacity'] != self.capacity or len(state['sizes']) != self.num_shards:
+            raise ValueError("Buffer capacity or shard count mismatch with checkpoint")
+        for name in self._FIELDS:
+            getattr(self, name)[:] = state[name]
+        self.positions[:] = state['positions']
+        self.sizes[:] = state['sizes']
+
+class MemmapReplayBuffer(ReplayBuffer):
+    """ReplayBuffer stored in numpy.memmap files under a directory.
+
+    Each field is a .npy file opened with open_memmap and a small JSON index
+    holds position and size, so the store survives process restarts and can
+    be opened read-only by several learner processes that share it through
+    the page cache. Capacity is bounded by disk, not RAM.
+
+    The index is only rewritten by flush() (DQNAgent calls it on every
+    checkpoint and on close()); transitions pushed after the last flush
+    are not seen on reopen.
+    """
+
+    _FIELDS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+    def __init__(self, path, capacity=None, state_size=None, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        index_path = os.path.join(path, 'index.json')
+
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                index = json.load(f)
+            for key, value in (('capacity', capacity), ('state_size', state_size)):
+                if value is not None and int(value) != index[key]:
+                    raise ValueError(f"Replay store at {path} has {key} {index[key]}, "
+                                     f"reopened with {value}")
+            self.capacity = index['capacity']
+            self.state_size = index['state_size']
+            self.position = index['position']
+            self.size = index['size']
+            mode = 'r' if readonly else 'r+'
+            for name in self._FIELDS:
+                setattr(self, name, np.lib.format.open_memmap(self._file(name), mode=mode))
+        else:
+            if readonly:
+                raise FileNotFoundError(f"No replay store at {path}")
+            if capacity is None or state_size is None:
+                raise ValueError("capacity and state_size are required to create a new store")
+            os.makedirs(path, exist_ok=True)
+            self.capacity = int(capacity)
+            self.state_size = state_size
+            self.position = 0
+            self.size = 0
+            shapes = {
+                'states': ((self.capacity, state_size), np.float32),
+                'actions': ((self.capacity,), np.int64),
+                'rewards': ((self.capacity,), np.float32),
+                'next_states': ((self.capacity, state_size), np.float32),
+                'dones': ((self.capacity,), np.float32)
+            }
+            for name, (shape, dtype) in shapes.items():
+                setattr(self, name, np.lib.format.open_memmap(
+                    self._file(name), mode='w+', dtype=dtype, shape=shape))
+            self.flush()
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.npy")
+
+    def push(self, state, action, reward, next_state, done):
+        if self.readonly:
+            raise PermissionError("Replay store opened read-only")
+        return super().push(state, action, reward, next_state, done)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        if self.readonly:
+            raise PermissionError("Replay store opened read-only")
+        return super().push_batch(states, actions, rewards, next_states, dones)
+
+    def sample_indices(self, batch_size):
+        # Sorted reads touch the mapped pages in file order
+        return np.sort(super().sample_indices(batch_size))
+
+    def flush(self):
+        """Flush the mapped arrays and atomically rewrite the index"""
+        for name in self._FIELDS:
+            getattr(self, name).flush()
+        index = {
+            'capacity': self.capacity,
+            'state_size': self.state_size,
+            'position': self.position,
+            'size': self.size
+        }
+        tmp_path = os.path.join(self.path, 'index.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, os.path.join(self.path, 'index.json'))
+
+    def refresh(self):
+        """Re-read the index, so read-only readers see the writer's latest flush"""
+        with open(os.path.join(self.path, 'index.json')) as f:
+            index = json.load(f)
+        self.position = index['position']
+        self.size = index['size']
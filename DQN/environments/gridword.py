@@ -38,4 +38,90 @@ class GridWorld:
         return self.get_state(), reward, done
     
     def get_action_meanings(self):
-        return ["UP", "DOWN", "LEFT", "RIGHT"]
\ No newline at end of file
+        return ["UP", "DOWN", "LEFT", "RIGHT"]
+
+_MASK32 = 0xFFFFFFFF
+
+def _hash32(x):
+    """Integer mix on int64 tensors holding 32-bit values (lowbias32 variant)"""
+    x = ((x ^ (x >> 16)) * 0x45d9f3b) & _MASK32
+    x = ((x ^ (x >> 16)) * 0x45d9f3b) & _MASK32
+    return x ^ (x >> 16)
+
+class BatchedGridWorld:
+    """N independent GridWorld copies stepped with one vectorized call.
+
+    Each env draws its goals from its own counter-based stream derived from
+    (seed, env index, episode number), so an env's sequence of goals does not
+    depend on how many other envs run beside it. Finished envs are reset in
+    place by step(); the observations to act on next are in get_state().
+    """
+
+    # (dx, dy) for UP, DOWN, LEFT, RIGHT, same as GridWorld.step
+    MOVES = torch.tensor([[0, -1], [0, 1], [-1, 0], [1, 0]])
+
+    def __init__(self, num_envs, size=5, max_steps=None, seed=None):
+        self.num_envs = num_envs
+        self.size = size
+        self.max_steps = max_steps
+
+        if seed is None:
+            seed = random.randrange(_MASK32 + 1)
+        env_ids = torch.arange(num_envs, dtype=torch.int64)
+        self.seeds = _hash32((env_ids * 0x9E3779B9 + seed) & _MASK32)
+        self.episodes = torch.zeros(num_envs, dtype=torch.int64)
+        self.steps = torch.zeros(num_envs, dtype=torch.int64)
+
+        self.agent_pos = torch.zeros(num_envs, 2, dtype=torch.int64)
+        self.goal_pos = torch.zeros(num_envs, 2, dtype=torch.int64)
+        self.state = torch.zeros(num_envs, 4)
+        self.truncated = torch.zeros(num_envs, dtype=torch.bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset all envs, or only those selected by a boolean mask"""
+        if mask is None:
+            idx = torch.arange(self.num_envs)
+        else:
+            idx = mask.nonzero().squeeze(1)
+
+        self.agent_pos[idx] = 0
+        self.steps[idx] = 0
+
+        # Goal cell drawn uniformly among the cells other than the start (0, 0)
+        draw = _hash32(self.seeds[idx] ^ _hash32(self.episodes[idx] & _MASK32))
+        cells = 1 + draw % (self.size * self.size - 1)
+        self.goal_pos[idx, 0] = cells % self.size
+        self.goal_pos[idx, 1] = cells // self.size
+        self.episodes[idx] += 1
+
+        self.state[idx] = torch.cat([self.agent_pos[idx], self.goal_pos[idx]], dim=1).float()
+        return self.get_state()
+
+    def get_state(self):
+        return self.state.clone()
+
+    def step(self, actions):
+        """Returns (next_states, rewards, dones) for the transitions just taken"""
+        actions = torch.as_tensor(actions, dtype=torch.int64)
+        self.agent_pos.add_(self.MOVES[actions]).clamp_(0, self.size - 1)
+        self.steps += 1
+
+        dones = (self.agent_pos == self.goal_pos).all(dim=1)
+        rewards = torch.where(dones, 10.0, -0.1)
+        next_states = torch.cat([self.agent_pos, self.goal_pos], dim=1).float()
+
+        if self.max_steps is not None:
+            self.truncated = ~dones & (self.steps >= self.max_steps)
+            finished = dones | self.truncated
+        else:
+            finished = dones
+
+        self.state.copy_(next_states)
+        if finished.any():
+            self.reset(finished)
+
+        return next_states, rewards, dones
+
+    def get_action_meanings(self):
+        return ["UP", "DOWN", "LEFT", "RIGHT"]
@@ -40,4 +40,39 @@ class DuelingDQN(nn.Module):
         x = self.feature(x)
         advantage = self.advantage(x)
         value = self.value(x)
-        return value + advantage - advantage.mean()
\ No newline at end of file
+        return value + advantage - advantage.mean()
+
+def from_state_dict(state_dict):
+    """DQN or DuelingDQN with the sizes of state_dict, with its weights loaded"""
+    if 'feature.0.weight' in state_dict:
+        hidden_size, input_size = state_dict['feature.0.weight'].shape
+        output_size = state_dict['advantage.2.weight'].shape[0]
+        model = DuelingDQN(input_size, output_size, hidden_size)
+    else:
+        hidden_size, input_size = state_dict['network.0.weight'].shape
+        output_size = state_dict['network.4.weight'].shape[0]
+        model = DQN(input_size, output_size, hidden_size)
+    model.load_state_dict(state_dict)
+    return model
+
+def export_numpy(model, path):
+    """Write DQN / DuelingDQN weights to a flat .npz readable by models.numpy_policy"""
+    import numpy as np
+
+    if isinstance(model, DuelingDQN):
+        arch, branches = 'dueling', ['feature', 'advantage', 'value']
+    elif isinstance(model, DQN):
+        arch, branches = 'dqn', ['network']
+    else:
+        raise TypeError(f"Unsupported model type: {type(model).__name__}")
+
+    arrays = {'arch': np.array(arch)}
+    for branch in branches:
+        linears = [m for m in getattr(model, branch) if isinstance(m, nn.Linear)]
+        for i, layer in enumerate(linears):
+            # Stored as [in, out] so the runtime computes x @ W + b
+            arrays[f"{branch}.{i}.weight"] = layer.weight.detach().cpu().numpy().T.astype(np.float32)
+            arrays[f"{branch}.{i}.bias"] = layer.bias.detach().cpu().numpy().astype(np.float32)
+
+    np.savez(path, **arrays)
+    return path
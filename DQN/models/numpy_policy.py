@@ -0,0 +1,56 @@
+"""NumPy-only runtime for policies written by models.networks.export_numpy.
+
+Deliberately free of any torch import so short-lived evaluation jobs can
+load and run a trained policy without paying torch's startup cost.
+"""
+import numpy as np
+
+class NumpyPolicy:
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.arch = str(data['arch'])
+            self.layers = {}
+            for key in data.files:
+                if key == 'arch':
+                    continue
+                branch, i, kind = key.split('.')
+                self.layers.setdefault(branch, {}).setdefault(int(i), {})[kind] = data[key]
+
+        # Ordered (W, b) lists per branch, ready for the forward pass
+        self.branches = {
+            branch: [(layers[i]['weight'], layers[i]['bias']) for i in sorted(layers)]
+            for branch, layers in self.layers.items()
+        }
+
+    @staticmethod
+    def _mlp(x, layers, final_relu=False):
+        last = len(layers) - 1
+        for i, (w, b) in enumerate(layers):
+            x = x @ w + b
+            if i < last or final_relu:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def q_values(self, states):
+        """Q-values for one state [state_size] or a batch [N, state_size]"""
+        x = np.asarray(states, dtype=np.float32)
+        single = x.ndim == 1
+        if single:
+            x = x[None, :]
+
+        if self.arch == 'dueling':
+            features = self._mlp(x, self.branches['feature'], final_relu=True)
+            advantage = self._mlp(features, self.branches['advantage'])
+            value = self._mlp(features, self.branches['value'])
+            # Same reduction as DuelingDQN.forward: mean over the whole batch
+            q = value + advantage - advantage.mean()
+        else:
+            q = self._mlp(x, self.branches['network'])
+
+        return q[0] if single else q
+
+    def act(self, state):
+        return int(np.argmax(self.q_values(state)))
+
+    def act_batch(self, states):
+        return np.argmax(self.q_values(states), axis=1)
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import shutil
+import tempfile
+import time
+import numpy as np
+from agents.replay_buffer import ReplayBuffer, MemmapReplayBuffer
+
+def fill(buffer, num_transitions, chunk=100000, state_size=4):
+    """Fill a buffer with random GridWorld-shaped transitions"""
+    for start in range(0, num_transitions, chunk):
+        n = min(chunk, num_transitions - start)
+        states = np.random.randint(0, 5, size=(n, state_size)).astype(np.float32)
+        buffer.push_batch(states, np.random.randint(0, 4, n), np.full(n, -0.1),
+                          states, np.zeros(n))
+
+def sampling_throughput(buffer, batch_size=32, duration=2.0):
+    """Sampled transitions per second over roughly `duration` seconds"""
+    batches = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        buffer.sample(batch_size)
+        batches += 1
+    return batches * batch_size / (time.perf_counter() - start)
+
+def main(capacity=1000000, batch_sizes=(32, 256, 1024)):
+    print(f" Replay sampling benchmark ({capacity} transitions)")
+    print("=" * 50)
+
+    in_memory = ReplayBuffer(capacity, 4)
+    fill(in_memory, capacity)
+
+    store_dir = tempfile.mkdtemp(prefix="replay_")
+    try:
+        on_disk = MemmapReplayBuffer(store_dir, capacity, 4)
+        fill(on_disk, capacity)
+        on_disk.flush()
+        reopened = MemmapReplayBuffer(store_dir, readonly=True)
+
+        for batch_size in batch_sizes:
+            mem = sampling_throughput(in_memory, batch_size)
+            disk = sampling_throughput(reopened, batch_size)
+            print(f" batch {batch_size:5d}: in-memory {mem:12,.0f}/s | "
+                  f"memmap {disk:12,.0f}/s | ratio {disk / mem:.2f}")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
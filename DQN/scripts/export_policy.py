@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import torch
+from models.networks import from_state_dict, export_numpy
+from models.numpy_policy import NumpyPolicy
+
+def check_parity(model, policy, num_states=1000, grid_size=5, atol=1e-5):
+    """Compare the NumPy runtime against the torch model, single and batched"""
+    state_size = next(model.parameters()).shape[1]
+    states = np.random.randint(0, grid_size, size=(num_states, state_size)).astype(np.float32)
+
+    with torch.no_grad():
+        expected = model(torch.from_numpy(states)).numpy()
+        expected_single = model(torch.from_numpy(states[:1])).numpy()[0]
+
+    batch_error = np.abs(policy.q_values(states) - expected).max()
+    single_error = np.abs(policy.q_values(states[0]) - expected_single).max()
+    error = float(max(batch_error, single_error))
+    return error <= atol, error
+
+def export_checkpoint(checkpoint_path, output_path):
+    """Export a DQNAgent.save_checkpoint file and verify the exported runtime.
+
+    The architecture and its sizes are read from the checkpoint's weights.
+    """
+    checkpoint = torch.load(checkpoint_path, map_location='cpu')
+    model = from_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+
+    export_numpy(model, output_path)
+    ok, error = check_parity(model, NumpyPolicy(output_path))
+    status = "OK" if ok else "MISMATCH"
+    print(f" {checkpoint_path} -> {output_path}: parity {status} (max abs error {error:.2e})")
+    return ok
+
+def main():
+    print(" Exporting DQN policies to NumPy")
+    export_checkpoint("models/dqn_simple.pth", "models/dqn_simple.npz")
+    export_checkpoint("models/dqn_replay.pth", "models/dqn_replay.npz")
+
+if __name__ == "__main__":
+    main()
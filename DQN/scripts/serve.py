@@ -0,0 +1,194 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import argparse
+import json
+import time
+from collections import deque
+import numpy as np
+import torch
+from models.networks import from_state_dict
+
+def load_policy(checkpoint_path):
+    """Build a DQN in eval mode from a DQNAgent.save_checkpoint file.
+
+    State, action and hidden sizes come from the saved weights, so
+    checkpoints trained with any TrainingConfig.hidden_size load.
+    """
+    checkpoint = torch.load(checkpoint_path, map_location='cpu')
+    model = from_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+    return model
+
+class PolicyServer:
+    """Asyncio policy server that coalesces concurrent requests into micro-batches.
+
+    Protocol: one JSON object per line. {"state": [ax, ay, gx, gy]} is
+    answered with {"action": a, "q_values": [...]}; {"cmd": "stats"} returns
+    the latency percentiles and batch statistics. A malformed request is
+    answered with {"error": "..."} and the connection stays open.
+    """
+
+    def __init__(self, model, max_batch=64, max_wait_ms=2.0, latency_window=10000):
+        self.model = model
+        self.state_size = next(m for m in model.modules() if isinstance(m, torch.nn.Linear)).in_features
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = None
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+        self.requests = 0
+
+    async def infer(self, state):
+        """Queue one state and wait for its batched result"""
+        state = np.asarray(state, dtype=np.float32)
+        if state.shape != (self.state_size,):
+            raise ValueError(f"state must be a list of {self.state_size} numbers, got shape {state.shape}")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((state, future, time.perf_counter()))
+        return await future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            # Collect until the batch is full or the oldest request hits max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(items) < self.max_batch and not self.queue.empty():
+                items.append(self.queue.get_nowait())
+
+            try:
+                states = torch.from_numpy(np.stack([item[0] for item in items]))
+                with torch.no_grad():
+                    q_values = self.model(states)
+                actions = q_values.argmax(dim=1).tolist()
+                q_values = q_values.tolist()
+            except Exception as e:
+                # Fail this batch's requests, keep the batcher running
+                for _, future, _ in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            for (_, future, arrived), action, q in zip(items, actions, q_values):
+                if not future.done():
+                    future.set_result((action, q))
+                self.latencies.append(now - arrived)
+            self.batch_sizes.append(len(items))
+            self.requests += len(items)
+
+    def stats(self):
+        if not self.latencies:
+            return {'requests': self.requests}
+        latencies_ms = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        return {
+            'requests': self.requests,
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'mean_batch': float(np.mean(self.batch_sizes))
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    if request.get('cmd') == 'stats':
+                        response = self.stats()
+                    elif 'state' not in request:
+                        raise ValueError("request needs a 'state' or a 'cmd' key")
+                    else:
+                        action, q = await self.infer(request['state'])
+                        response = {'action': action, 'q_values': q}
+                except (ValueError, TypeError) as e:
+                    # json.JSONDecodeError is a ValueError
+                    response = {'error': str(e)}
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self._handle, path=unix_path)
+            print(f"Policy server listening on {unix_path}")
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+            print(f"Policy server listening on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+class PolicyClient:
+    """Minimal asyncio client for PolicyServer"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _request(self, request):
+        self.writer.write((json.dumps(request) + '\n').encode())
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    async def act(self, state):
+        response = await self._request({'state': [float(x) for x in state]})
+        return response['action']
+
+    async def stats(self):
+        return await self._request({'cmd': 'stats'})
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching DQN policy server")
+    parser.add_argument('checkpoint', nargs='?', default="models/dqn_replay.pth")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="Unix socket path (overrides host/port)")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    server = PolicyServer(load_policy(args.checkpoint), args.max_batch, args.max_wait_ms)
+    asyncio.run(server.serve(args.host, args.port, args.unix))
+
+if __name__ == "__main__":
+    main()
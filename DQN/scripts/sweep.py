@@ -0,0 +1,134 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import itertools
+import json
+import random
+import time
+import multiprocessing as mp
+import numpy as np
+from utils.config import TrainingConfig
+
+def grid_search(space):
+    """Every combination of the values listed per TrainingConfig field"""
+    fields = sorted(space)
+    return [dict(zip(fields, values)) for values in itertools.product(*(space[f] for f in fields))]
+
+def random_search(space, num_samples, seed=0):
+    """num_samples draws, one value per field; callables are called with the RNG"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(num_samples):
+        samples.append({
+            field: values(rng) if callable(values) else rng.choice(values)
+            for field, values in sorted(space.items())
+        })
+    return samples
+
+def make_config(overrides):
+    config = TrainingConfig()
+    for field, value in overrides.items():
+        if not hasattr(config, field):
+            raise ValueError(f"Unknown TrainingConfig field: {field}")
+        setattr(config, field, value)
+    return config
+
+def _init_worker(counter, threads_per_worker):
+    """Pin each pool worker's torch threads (and CPU, on Linux) before any run"""
+    import torch
+    torch.set_num_threads(threads_per_worker)
+
+    with counter.get_lock():
+        worker_id = counter.value
+        counter.value += 1
+
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        first = (worker_id * threads_per_worker) % len(cpus)
+        os.sched_setaffinity(0, {cpus[(first + i) % len(cpus)] for i in range(threads_per_worker)})
+
+def _run(job):
+    """Train one (config, seed) pair and write its score curve to disk"""
+    # Imported here so only the workers pay for torch
+    from scripts.train import train_experiment
+
+    run_id, overrides, seed, use_replay, out_dir = job
+    config = make_config(overrides)
+    start = time.time()
+    scores, _ = train_experiment(
+        use_replay=use_replay,
+        model_path=os.path.join(out_dir, "models", f"{run_id}.pth"),
+        config=config,
+        seed=seed,
+        verbose=False
+    )
+
+    record = {
+        'run_id': run_id,
+        'config': overrides,
+        'seed': seed,
+        'scores': [float(s) for s in scores],
+        'final_score': float(np.mean(scores[-max(1, len(scores) // 10):])),
+        'seconds': time.time() - start
+    }
+    with open(os.path.join(out_dir, "runs", f"{run_id}.json"), 'w') as f:
+        json.dump(record, f)
+    return record
+
+def run_sweep(configs, seeds=(0, 1, 2), use_replay=True, out_dir="results/sweep",
+              num_workers=None, threads_per_worker=1):
+    """Fan (config, seed) runs over a process pool and rank configs by final score.
+
+    Each run's curve is written to out_dir/runs/<run_id>.json as soon as it
+    finishes and a summary line is appended to out_dir/results.jsonl. The
+    ranking (mean final score over seeds, best first) goes to ranking.json.
+    """
+    os.makedirs(os.path.join(out_dir, "runs"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "models"), exist_ok=True)
+
+    jobs = [(f"c{c:04d}_s{seed}", overrides, seed, use_replay, out_dir)
+            for c, overrides in enumerate(configs) for seed in seeds]
+    if num_workers is None:
+        num_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+
+    ctx = mp.get_context('spawn')
+    counter = ctx.Value('i', 0)
+    finals = {}
+
+    print(f" Sweep: {len(configs)} configs x {len(seeds)} seeds on {num_workers} workers")
+    with open(os.path.join(out_dir, "results.jsonl"), 'a') as summary, \
+            ctx.Pool(num_workers, initializer=_init_worker,
+                     initargs=(counter, threads_per_worker)) as pool:
+        for done, record in enumerate(pool.imap_unordered(_run, jobs), 1):
+            summary.write(json.dumps({k: v for k, v in record.items() if k != 'scores'}) + '\n')
+            summary.flush()
+            key = json.dumps(record['config'], sort_keys=True)
+            finals.setdefault(key, []).append(record['final_score'])
+            print(f" [{done}/{len(jobs)}] {record['run_id']}: final {record['final_score']:.2f} "
+                  f"({record['seconds']:.1f}s)")
+
+    ranking = sorted(
+        ({'config': json.loads(key), 'mean_final_score': float(np.mean(v)),
+          'std_final_score': float(np.std(v)), 'seeds': len(v)} for key, v in finals.items()),
+        key=lambda r: r['mean_final_score'], reverse=True
+    )
+    with open(os.path.join(out_dir, "ranking.json"), 'w') as f:
+        json.dump(ranking, f, indent=2)
+    return ranking
+
+def main():
+    space = {
+        'learning_rate': [0.0005, 0.001, 0.005],
+        'gamma': [0.9, 0.95, 0.99],
+        'batch_size': [32, 64],
+        'memory_size': [100, 2000]
+    }
+    ranking = run_sweep(grid_search(space))
+
+    print("\n Top configurations:")
+    for rank, entry in enumerate(ranking[:5], 1):
+        print(f" {rank}. {entry['mean_final_score']:.2f} ± {entry['std_final_score']:.2f} {entry['config']}")
+
+if __name__ == "__main__":
+    main()
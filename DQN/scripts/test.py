@@ -2,14 +2,16 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from environments.gridworld import GridWorld
+from environments.gridword import GridWorld
 from agents.dqn_agent import DQNAgent
+from utils.evaluation import evaluate_greedy
+from utils.visualization import Visualizer
 
 def test_agent(agent_path, num_episodes=10, agent_name="DQN Agent"):
     """Test a trained agent"""
     
     env = GridWorld()
-    agent = DQNAgent(state_size=4, action_size=4)
+    agent = DQNAgent(state_size=4, action_size=4, model_path=agent_path)
     
     if not agent.load_checkpoint():
         print(f" Could not load model from {agent_path}")
@@ -51,12 +53,37 @@ def test_agent(agent_path, num_episodes=10, agent_name="DQN Agent"):
     print(f"   Success Rate: {success_rate:.1f}% ({success_count}/{num_episodes})")
     print(f"   Average Steps (on success): {avg_steps:.1f}")
 
+def evaluate_exhaustive(agent_path, agent_name="DQN Agent", size=5, max_steps=50, q_map_path=None):
+    """Deterministic greedy evaluation over every (start, goal) pair"""
+    
+    agent = DQNAgent(state_size=4, action_size=4, model_path=agent_path)
+    if not agent.load_checkpoint():
+        print(f" Could not load model from {agent_path}")
+        return None
+    
+    report, q_map = evaluate_greedy(agent.model, size=size, max_steps=max_steps)
+    
+    print(f"\n📊 Exhaustive evaluation of {agent_name} ({report['pairs']} start/goal pairs):")
+    print(f"   Success Rate: {report['success_rate'] * 100:.1f}% ({report['successes']}/{report['pairs']})")
+    print(f"   Average Steps (on success): {report['mean_steps']:.2f}")
+    print(f"   Optimality gap vs Manhattan: {report['mean_optimality_gap']:.2f} steps "
+          f"({report['optimal_fraction'] * 100:.1f}% optimal)")
+    
+    if q_map_path:
+        Visualizer().plot_q_values(q_map, save_path=q_map_path, show=False)
+    return report
+
 def main():
     print(" GridWorld DQN Testing")
     
     # Test both agents
     test_agent("models/dqn_simple.pth", agent_name="DQN Simple")
     test_agent("models/dqn_replay.pth", agent_name="DQN with Replay")
+    
+    evaluate_exhaustive("models/dqn_simple.pth", agent_name="DQN Simple",
+                        q_map_path="results/q_values_simple.png")
+    evaluate_exhaustive("models/dqn_replay.pth", agent_name="DQN with Replay",
+                        q_map_path="results/q_values_replay.png")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
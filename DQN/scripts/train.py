@@ -2,36 +2,85 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from environments.gridworld import GridWorld
+import random
+import torch
+from environments.gridword import GridWorld
 from agents.dqn_agent import DQNAgent
 from utils.visualization import Visualizer
 from utils.config import ExperimentConfig
+from utils.checkpoint import CheckpointManager
 import numpy as np
 
-def train_experiment(use_replay=True, episodes=500, model_path="models/dqn_model.pth"):
-    """Train a single DQN agent with or without experience replay"""
+def train_experiment(use_replay=True, episodes=500, model_path="models/dqn_model.pth",
+                     memory_size=2000, prioritized=False, checkpoint_dir=None,
+                     checkpoint_every=100, include_replay=True, config=None, seed=None,
+                     verbose=True, telemetry=None, recorder=None):
+    """Train a single DQN agent with or without experience replay
+
+    With checkpoint_dir set, the run saves a rotating checkpoint every
+    checkpoint_every episodes and resumes from the latest one on restart.
+    A TrainingConfig, when given, sets the grid size, episode count, step
+    limit and agent hyperparameters. A utils.telemetry.Telemetry, when
+    given, records per-phase timings and throughput; a
+    utils.metrics.MetricsRecorder created with
+    fields=('reward', 'steps', 'epsilon') logs every episode to disk.
+    """
+    
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
     
-    env = GridWorld()
+    max_steps = 100
+    grid_size = 5
+    if config is not None:
+        episodes = config.episodes
+        max_steps = config.max_steps
+        grid_size = config.grid_size
+    
+    env = GridWorld(size=grid_size)
     agent = DQNAgent(
         state_size=4, 
         action_size=4, 
         use_replay=use_replay,
-        model_path=model_path
+        model_path=model_path,
+        memory_size=memory_size,
+        prioritized=prioritized,
+        config=config
     )
     
+    if telemetry is not None:
+        agent.telemetry = telemetry
+    tel = agent.telemetry
+    
     scores = []
+    start_episode = 0
     
-    for episode in range(episodes):
+    checkpoints = None
+    if checkpoint_dir is not None:
+        checkpoints = CheckpointManager(checkpoint_dir)
+        resumed = checkpoints.load(agent)
+        if resumed is not None:
+            start_episode = resumed.get('episode', checkpoints.loaded_step) + 1
+            scores = resumed.get('scores', [])
+            if verbose:
+                print(f"Resuming from episode {start_episode}")
+    
+    for episode in range(start_episode, episodes):
         state = env.reset()
         total_reward = 0
         steps = 0
         
         while True:
-            action = agent.act(state)
-            next_state, reward, done = env.step(action)
+            with tel.phase('action_selection'):
+                action = agent.act(state)
+            with tel.phase('env_step'):
+                next_state, reward, done = env.step(action)
+            tel.count('env_steps')
             
             if agent.use_replay:
-                agent.remember(state, action, reward, next_state, done)
+                with tel.phase('remember'):
+                    agent.remember(state, action, reward, next_state, done)
                 agent.replay(agent.batch_size)
             else:
                 agent.learn(state, action, reward, next_state, done)
@@ -40,16 +89,28 @@ def train_experiment(use_replay=True, episodes=500, model_path="models/dqn_model
             steps += 1
             state = next_state
             
-            if done or steps > 100:
+            if done or steps > max_steps:
                 break
         
         # Update epsilon after each episode
         agent.update_epsilon()
         scores.append(total_reward)
+        tel.end_episode(episode, total_reward)
+        if recorder is not None:
+            recorder.record(episode, reward=total_reward, steps=steps, epsilon=agent.epsilon)
         
-        if episode % 100 == 0:
+        if verbose and episode % 100 == 0:
             method = "avec Replay" if use_replay else "sans Replay"
             print(f"{method} - Episode {episode}, Score: {total_reward:.2f}, Epsilon: {agent.epsilon:.3f}")
+        
+        if checkpoints is not None and (episode + 1) % checkpoint_every == 0:
+            checkpoints.save(agent, episode, include_replay=include_replay,
+                             extra={'episode': episode, 'scores': list(scores)})
+    
+    if checkpoints is not None:
+        checkpoints.wait()
+    if recorder is not None:
+        recorder.flush()
     
     # Save final model
     agent.save_checkpoint()
@@ -0,0 +1,154 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import random
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from environments.gridword import GridWorld
+from agents.dqn_agent import DQNAgent
+from agents.replay_buffer import SharedReplayBuffer
+from models.networks import DQN
+
+class SharedWeights:
+    """Shared-memory copy of the learner's weights with a version counter"""
+
+    def __init__(self, state_size, action_size, ctx):
+        self.model = DQN(state_size, action_size)
+        self.model.share_memory()
+        self.version = ctx.Value('l', 0)
+        self.lock = ctx.Lock()
+
+    def publish(self, model):
+        with self.lock:
+            self.model.load_state_dict(model.state_dict())
+            self.version.value += 1
+
+    def pull(self, model, last_version):
+        """Copy the weights into model if a newer version exists"""
+        if self.version.value == last_version:
+            return last_version
+        with self.lock:
+            model.load_state_dict(self.model.state_dict())
+            return self.version.value
+
+def actor_process(actor_id, buffer, weights, scores, env_steps, stop_event,
+                  sync_every=100, max_steps=100, seed=0):
+    """Acting loop: own GridWorld, local DQN copy, writes into its buffer shard"""
+    torch.set_num_threads(1)
+    torch.manual_seed(seed + actor_id)
+    random.seed(seed + actor_id)
+    np.random.seed(seed + actor_id)
+
+    buffer.set_shard(actor_id)
+    env = GridWorld()
+    agent = DQNAgent(state_size=4, action_size=4, use_replay=False,
+                     model_path=f"models/actor_{actor_id}.pth", memory_size=1)
+    version = weights.pull(agent.model, -1)
+
+    steps_since_sync = 0
+    while not stop_event.is_set():
+        state = env.reset()
+        total_reward = 0
+        steps = 0
+
+        while True:
+            action = agent.act(state)
+            next_state, reward, done = env.step(action)
+            buffer.push(state, action, reward, next_state, done)
+
+            total_reward += reward
+            steps += 1
+            state = next_state
+
+            steps_since_sync += 1
+            if steps_since_sync >= sync_every:
+                version = weights.pull(agent.model, version)
+                steps_since_sync = 0
+
+            if done or steps > max_steps or stop_event.is_set():
+                break
+
+        env_steps[actor_id] += steps
+        agent.update_epsilon()
+        scores.put((actor_id, total_reward))
+
+def train_distributed(num_actors=4, total_steps=200000, batch_size=32, memory_size=100000,
+                      learn_start=1000, broadcast_every=50, actor_sync_every=100,
+                      model_path="models/dqn_distributed.pth", seed=0):
+    """Train DQN with several actor processes feeding one learner through shared memory"""
+
+    ctx = mp.get_context('spawn')
+    torch.manual_seed(seed)
+
+    buffer = SharedReplayBuffer(memory_size, state_size=4, num_shards=num_actors)
+    learner = DQNAgent(state_size=4, action_size=4, use_replay=True,
+                       model_path=model_path, memory_size=1)
+    learner.memory = buffer
+
+    weights = SharedWeights(4, 4, ctx)
+    weights.publish(learner.model)
+
+    env_steps = torch.zeros(num_actors, dtype=torch.int64).share_memory_()
+    scores_queue = ctx.Queue()
+    stop_event = ctx.Event()
+
+    actors = [
+        ctx.Process(target=actor_process,
+                    args=(i, buffer, weights, scores_queue, env_steps, stop_event,
+                          actor_sync_every, 100, seed))
+        for i in range(num_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    scores = []
+    updates = 0
+    start = time.time()
+    last_report = start
+
+    try:
+        while int(env_steps.sum()) < total_steps:
+            if len(buffer) < learn_start:
+                time.sleep(0.01)
+            else:
+                learner.replay(batch_size)
+                updates += 1
+                if updates % broadcast_every == 0:
+                    weights.publish(learner.model)
+
+            while not scores_queue.empty():
+                scores.append(scores_queue.get()[1])
+
+            if time.time() - last_report > 10:
+                elapsed = time.time() - start
+                print(f"Distributed - Steps: {int(env_steps.sum())}, "
+                      f"Env steps/s: {int(env_steps.sum()) / elapsed:.0f}, "
+                      f"Updates/s: {updates / elapsed:.0f}, Episodes: {len(scores)}")
+                last_report = time.time()
+    finally:
+        stop_event.set()
+        # Drain the queue so actors blocked on put() can exit
+        while any(actor.is_alive() for actor in actors):
+            while not scores_queue.empty():
+                scores.append(scores_queue.get()[1])
+            time.sleep(0.01)
+        for actor in actors:
+            actor.join()
+
+    elapsed = time.time() - start
+    print(f"\nDistributed training with {num_actors} actors: "
+          f"{int(env_steps.sum()) / elapsed:.0f} env steps/s, {updates / elapsed:.0f} updates/s")
+
+    learner.save_checkpoint()
+    return scores, learner
+
+def main():
+    print("🚀 Starting distributed GridWorld DQN Training...")
+    scores, agent = train_distributed(num_actors=max(1, os.cpu_count() - 1))
+    print(f"\n✅ Training completed! {len(scores)} episodes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+import torch
+from environments.gridword import GridWorld, BatchedGridWorld
+
+def test_steps_match_single_gridworld():
+    """Each copy moves, rewards and finishes exactly like GridWorld.step"""
+    batch = BatchedGridWorld(6, size=5, seed=0)
+    singles = [GridWorld(size=5) for _ in range(6)]
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        state = batch.get_state()
+        for env, row in zip(singles, state.long().tolist()):
+            env.agent_pos, env.goal_pos = row[:2], row[2:]
+
+        actions = rng.integers(4, size=6)
+        next_states, rewards, dones = batch.step(actions)
+        for k, env in enumerate(singles):
+            next_state, reward, done = env.step(int(actions[k]))
+            assert torch.equal(next_states[k], next_state)
+            assert rewards[k].item() == pytest.approx(reward)
+            assert dones[k].item() == done
+
+def test_finished_envs_reset_in_place():
+    batch = BatchedGridWorld(1, size=3, seed=5)
+    goal = batch.goal_pos[0].tolist()
+    # Walk right then down onto the goal
+    actions = [3] * goal[0] + [1] * goal[1]
+    for action in actions:
+        next_states, rewards, dones = batch.step([action])
+    assert dones[0] and rewards[0] == 10.0
+    assert next_states[0, :2].tolist() == goal
+    assert batch.get_state()[0, :2].tolist() == [0, 0]
+    assert batch.episodes[0] == 2
+
+def test_goals_do_not_depend_on_batch_size():
+    small = BatchedGridWorld(2, size=5, seed=42)
+    large = BatchedGridWorld(8, size=5, seed=42)
+    for _ in range(5):
+        assert torch.equal(small.goal_pos, large.goal_pos[:2])
+        small.reset()
+        large.reset()
+
+def test_goals_avoid_start_and_cover_grid():
+    batch = BatchedGridWorld(2000, size=4, seed=1)
+    cells = (batch.goal_pos[:, 1] * 4 + batch.goal_pos[:, 0]).numpy()
+    counts = np.bincount(cells, minlength=16)
+    assert counts[0] == 0
+    assert (counts[1:] > 0).all()
+
+def test_max_steps_truncates_without_done():
+    batch = BatchedGridWorld(3, size=5, max_steps=4, seed=0)
+    # UP from row 0 never moves, so no env can reach its goal
+    for step in range(4):
+        _, _, dones = batch.step([0, 0, 0])
+        assert not dones.any()
+    assert batch.truncated.all()
+    assert (batch.steps == 0).all()
+    assert (batch.episodes == 2).all()
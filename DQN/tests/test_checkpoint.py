@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+import torch
+from agents.dqn_agent import DQNAgent
+from scripts.train import train_experiment
+from utils.checkpoint import CheckpointManager
+
+def _train(tmp_path, name, episodes, checkpoint_dir=None, prioritized=False, seed=0):
+    return train_experiment(episodes=episodes, model_path=str(tmp_path / name / "model.pth"),
+                            memory_size=500, prioritized=prioritized,
+                            checkpoint_dir=checkpoint_dir, checkpoint_every=3, seed=seed,
+                            verbose=False)
+
+@pytest.mark.parametrize("prioritized", [False, True])
+def test_resume_reproduces_uninterrupted_run(tmp_path, prioritized):
+    scores, agent = _train(tmp_path, "full", 6, str(tmp_path / "full_ckpt"), prioritized)
+
+    checkpoint_dir = str(tmp_path / "resumed_ckpt")
+    _train(tmp_path, "resumed", 3, checkpoint_dir, prioritized)
+    # Restart after the episode 2 checkpoint; another seed, since the weights,
+    # optimizer, replay buffer and RNG states must all come from the checkpoint
+    resumed_scores, resumed = _train(tmp_path, "resumed", 6, checkpoint_dir, prioritized, seed=1)
+
+    assert resumed_scores == scores
+    assert resumed.epsilon == agent.epsilon
+    for name, tensor in agent.model.state_dict().items():
+        assert torch.equal(resumed.model.state_dict()[name], tensor), name
+
+def test_rotation_keeps_newest(tmp_path):
+    agent = DQNAgent(4, 4, model_path=str(tmp_path / "model.pth"))
+    checkpoints = CheckpointManager(str(tmp_path / "ckpt"), keep=3)
+    for step in range(5):
+        checkpoints.save(agent, step, extra={'episode': step})
+    checkpoints.wait()
+
+    names = [os.path.basename(path) for path in checkpoints.list_checkpoints()]
+    assert names == [f"ckpt_{step:010d}.pt" for step in (2, 3, 4)]
+    assert not [f for f in os.listdir(tmp_path / "ckpt") if f.endswith(".tmp")]
+
+    assert checkpoints.load(agent) == {'episode': 4}
+    assert checkpoints.loaded_step == 4
+
+def test_load_without_checkpoint(tmp_path):
+    agent = DQNAgent(4, 4, model_path=str(tmp_path / "model.pth"))
+    assert CheckpointManager(str(tmp_path / "empty")).load(agent) is None
+
+def test_keep_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        CheckpointManager(str(tmp_path), keep=0)
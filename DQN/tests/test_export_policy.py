@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+import torch
+from models.networks import DQN, DuelingDQN, export_numpy
+from models.numpy_policy import NumpyPolicy
+
+@pytest.mark.parametrize("network", [DQN, DuelingDQN])
+def test_numpy_policy_matches_torch(tmp_path, network):
+    """Random-weight network exported to .npz gives the same Q-values and actions"""
+    torch.manual_seed(0)
+    model = network(4, 4)
+    model.eval()
+    path = str(tmp_path / "policy.npz")
+    export_numpy(model, path)
+    policy = NumpyPolicy(path)
+
+    states = np.random.default_rng(0).normal(size=(256, 4)).astype(np.float32)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(states)).numpy()
+        # DuelingDQN subtracts the advantage mean over the batch, so a single
+        # state is compared with a batch of one
+        expected_single = model(torch.from_numpy(states[:1])).numpy()[0]
+
+    assert np.allclose(policy.q_values(states), expected, atol=1e-5)
+    assert np.allclose(policy.q_values(states[0]), expected_single, atol=1e-5)
+    assert np.array_equal(policy.act_batch(states), expected.argmax(axis=1))
+
+@pytest.mark.parametrize("network, hidden_size", [(DQN, 32), (DuelingDQN, 16)])
+def test_export_checkpoint_reads_sizes(tmp_path, network, hidden_size):
+    """Checkpoints with non-default sizes export and pass the parity check"""
+    from scripts.export_policy import export_checkpoint
+
+    torch.manual_seed(0)
+    model = network(6, 3, hidden_size)
+    torch.save({'model_state_dict': model.state_dict()}, tmp_path / "m.pth")
+
+    assert export_checkpoint(str(tmp_path / "m.pth"), str(tmp_path / "m.npz"))
+    policy = NumpyPolicy(str(tmp_path / "m.npz"))
+    states = np.random.default_rng(1).normal(size=(32, 6)).astype(np.float32)
+    with torch.no_grad():
+        assert np.allclose(policy.q_values(states), model(torch.from_numpy(states)).numpy(), atol=1e-5)
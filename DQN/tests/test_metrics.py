@@ -0,0 +1,26 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from utils.metrics import MetricsRecorder
+
+def test_reopen_appends_with_same_layout(tmp_path):
+    path = str(tmp_path / "metrics")
+    recorder = MetricsRecorder(path, chunk_size=4)
+    for episode in range(6):
+        recorder.record(episode, reward=float(episode), steps=10)
+    recorder.close()
+
+    recorder = MetricsRecorder(path, chunk_size=4)
+    recorder.record(6, reward=6.0, steps=10)
+    recorder.close()
+    assert list(recorder.read('episode')) == list(range(7))
+
+@pytest.mark.parametrize("kwargs", [{'fields': ('reward',), 'chunk_size': 4},
+                                    {'fields': ('reward', 'steps'), 'chunk_size': 8}])
+def test_reopen_with_other_layout_raises(tmp_path, kwargs):
+    path = str(tmp_path / "metrics")
+    MetricsRecorder(path, chunk_size=4).close()
+    with pytest.raises(ValueError):
+        MetricsRecorder(path, **kwargs)
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+from agents.replay_buffer import SumTree, PrioritizedReplayBuffer
+
+@pytest.mark.parametrize("capacity", [1, 7, 64, 100])
+def test_sum_tree_matches_brute_force(capacity):
+    rng = np.random.default_rng(capacity)
+    tree = SumTree(capacity)
+    priorities = np.zeros(capacity)
+    written = np.zeros(capacity, dtype=bool)
+    for _ in range(20):
+        indices = rng.choice(capacity, size=rng.integers(1, capacity + 1), replace=False)
+        values = rng.random(len(indices))
+        tree.update(indices, values)
+        priorities[indices] = values
+
+        assert tree.total() == pytest.approx(priorities.sum())
+        written[indices] = True
+        # Slots never written hold no priority and do not count for the minimum
+        assert tree.min() == pytest.approx(priorities[written].min())
+        np.testing.assert_allclose(tree.get(np.arange(capacity)), priorities)
+
+        # find() returns the leaf whose prefix-sum interval holds each value
+        queries = rng.random(50) * priorities.sum()
+        expected = np.searchsorted(np.cumsum(priorities), queries, side='left')
+        np.testing.assert_array_equal(tree.find(queries), expected)
+
+def _filled_buffer(priorities, alpha=1.0):
+    buffer = PrioritizedReplayBuffer(len(priorities), state_size=2, alpha=alpha, eps=0.0)
+    for i in range(len(priorities)):
+        buffer.push(np.full(2, i), 0, 0.0, np.zeros(2), False)
+    buffer.update_priorities(np.arange(len(priorities)), priorities)
+    return buffer
+
+def test_sampling_is_proportional_to_priority():
+    np.random.seed(0)
+    priorities = np.array([1.0, 2.0, 3.0, 4.0, 10.0, 0.5, 0.5, 3.0])
+    buffer = _filled_buffer(priorities)
+    counts = np.zeros(len(priorities))
+    for _ in range(200):
+        np.add.at(counts, buffer.sample_indices(64), 1)
+    frequencies = counts / counts.sum()
+    np.testing.assert_allclose(frequencies, priorities / priorities.sum(), atol=0.01)
+
+def test_alpha_flattens_priorities():
+    """P(i) is proportional to p_i ** alpha"""
+    np.random.seed(1)
+    priorities = np.array([1.0, 4.0, 16.0, 1.0])
+    buffer = _filled_buffer(priorities, alpha=0.5)
+    counts = np.zeros(len(priorities))
+    for _ in range(200):
+        np.add.at(counts, buffer.sample_indices(64), 1)
+    expected = np.sqrt(priorities) / np.sqrt(priorities).sum()
+    np.testing.assert_allclose(counts / counts.sum(), expected, atol=0.01)
+
+def test_importance_weights():
+    np.random.seed(2)
+    priorities = np.array([1.0, 2.0, 4.0, 8.0])
+    buffer = _filled_buffer(priorities)
+    beta = buffer.beta
+    _, indices, weights = buffer.sample(16)
+    np.testing.assert_allclose(weights.numpy(), (priorities[indices] / priorities.min()) ** -beta,
+                               rtol=1e-6)
+    assert weights.max() <= 1.0
+    assert buffer.beta == pytest.approx(beta + buffer.beta_increment)
+
+def test_new_transitions_get_max_priority():
+    buffer = _filled_buffer(np.array([0.1, 5.0, 0.2]))
+    # Ring of 3: the next push overwrites slot 0
+    buffer.push(np.zeros(2), 0, 0.0, np.zeros(2), False)
+    assert buffer.tree.get([0])[0] == pytest.approx(5.0)
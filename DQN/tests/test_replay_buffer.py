@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+from agents.dqn_agent import DQNAgent
+from agents.replay_buffer import MemmapReplayBuffer, SharedReplayBuffer
+
+def _fill(agent, n):
+    rng = np.random.default_rng(0)
+    agent.remember_batch(rng.random((n, 4), dtype=np.float32), rng.integers(4, size=n),
+                         rng.random(n, dtype=np.float32), rng.random((n, 4), dtype=np.float32),
+                         np.zeros(n, dtype=np.float32))
+
+def test_replay_dir_survives_restart(tmp_path):
+    replay_dir = str(tmp_path / "replay")
+    agent = DQNAgent(4, 4, model_path=str(tmp_path / "m.pth"), memory_size=100, replay_dir=replay_dir)
+    _fill(agent, 30)
+    agent.save_checkpoint()
+    _fill(agent, 5)
+    agent.close()
+
+    restarted = DQNAgent(4, 4, model_path=str(tmp_path / "m.pth"), memory_size=100, replay_dir=replay_dir)
+    assert len(restarted.memory) == 35
+    assert np.array_equal(restarted.memory.states[:35], agent.memory.states[:35])
+
+def test_reopen_with_other_capacity_raises(tmp_path):
+    MemmapReplayBuffer(str(tmp_path), 100, 4)
+    with pytest.raises(ValueError):
+        MemmapReplayBuffer(str(tmp_path), 200, 4)
+    assert MemmapReplayBuffer(str(tmp_path)).capacity == 100
+
+def test_prioritized_with_replay_dir_raises(tmp_path):
+    with pytest.raises(ValueError):
+        DQNAgent(4, 4, model_path=str(tmp_path / "m.pth"), prioritized=True,
+                 replay_dir=str(tmp_path / "replay"))
+
+@pytest.mark.parametrize("capacity, num_shards", [(3, 4), (10, 0)])
+def test_shared_buffer_rejects_empty_shards(capacity, num_shards):
+    with pytest.raises(ValueError):
+        SharedReplayBuffer(capacity, state_size=2, num_shards=num_shards)
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import json
+import torch
+from models.networks import DQN
+from scripts.serve import PolicyServer
+
+def test_malformed_requests_get_error_replies(tmp_path):
+    """Bad requests are answered with {"error": ...} on the same connection"""
+    torch.manual_seed(0)
+    server = PolicyServer(DQN(4, 4).eval(), max_wait_ms=0.5)
+    path = str(tmp_path / "policy.sock")
+
+    async def run():
+        serving = asyncio.create_task(server.serve(unix_path=path))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+
+        replies = []
+        for line in [b"not json\n", b"[1, 2]\n", b'{"foo": 1}\n', b'{"state": [1, 2]}\n',
+                     b'{"state": ["a", "b", "c", "d"]}\n', b'{"state": [0, 0, 4, 4]}\n']:
+            writer.write(line)
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+
+        writer.close()
+        serving.cancel()
+        return replies
+
+    replies = asyncio.run(run())
+    assert all('error' in reply for reply in replies[:-1])
+    assert replies[-1]['action'] in range(4)
+    assert len(replies[-1]['q_values']) == 4
+
+def test_load_policy_uses_checkpoint_sizes(tmp_path):
+    """A checkpoint trained with a non-default hidden size loads as saved"""
+    from agents.dqn_agent import DQNAgent
+    from utils.config import TrainingConfig
+    from scripts.serve import load_policy
+
+    config = TrainingConfig()
+    config.hidden_size = 32
+    agent = DQNAgent(4, 4, model_path=str(tmp_path / "m.pth"), config=config)
+    agent.save_checkpoint()
+
+    model = load_policy(str(tmp_path / "m.pth"))
+    states = torch.rand(8, 4)
+    with torch.no_grad():
+        assert torch.allclose(model(states), agent.model(states))
@@ -0,0 +1,20 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+from scripts.sweep import run_sweep
+
+def test_sweep_runs_one_trial(tmp_path):
+    """One config, one seed, two episodes through the real worker pool"""
+    ranking = run_sweep([{'episodes': 2, 'max_steps': 10}], seeds=(0,),
+                        out_dir=str(tmp_path), num_workers=1)
+
+    assert len(ranking) == 1
+    assert ranking[0]['seeds'] == 1
+    assert ranking[0]['config'] == {'episodes': 2, 'max_steps': 10}
+
+    with open(tmp_path / "runs" / "c0000_s0.json") as f:
+        record = json.load(f)
+    assert len(record['scores']) == 2
+    assert (tmp_path / "models" / "c0000_s0.pth").exists()
@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import csv
+import json
+from utils.telemetry import Telemetry
+
+def _emit(telemetry, episode, phases):
+    for name in phases:
+        with telemetry.phase(name):
+            pass
+    telemetry.count('env_steps', 10)
+    telemetry.end_episode(episode, 1.0)
+
+def test_csv_keeps_phases_that_appear_later(tmp_path):
+    """replay_sample only starts after the first record, it still gets a column"""
+    path = str(tmp_path / "tel.csv")
+    telemetry = Telemetry(path, every=1)
+    _emit(telemetry, 0, ['action_selection'])
+    _emit(telemetry, 1, ['action_selection', 'replay_sample'])
+    _emit(telemetry, 2, ['action_selection', 'replay_sample', 'priority_update'])
+    telemetry.close()
+
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert [row['episode'] for row in rows] == ['0', '1', '2']
+    assert rows[0]['replay_sample_calls'] == ''
+    assert rows[1]['replay_sample_calls'] == '1'
+    assert rows[2]['priority_update_calls'] == '1'
+    assert all(len(row) == len(rows[0]) for row in rows)
+
+def test_csv_append_reuses_existing_header(tmp_path):
+    path = str(tmp_path / "tel.csv")
+    first = Telemetry(path, every=1)
+    _emit(first, 0, ['action_selection', 'replay_sample'])
+    first.close()
+    second = Telemetry(path, every=1)
+    _emit(second, 1, ['action_selection', 'replay_sample'])
+    second.close()
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3 and lines[0].startswith('episode,')
+
+def test_jsonl_records_every_phase(tmp_path):
+    path = str(tmp_path / "tel.jsonl")
+    telemetry = Telemetry(path, every=1)
+    _emit(telemetry, 0, ['action_selection'])
+    _emit(telemetry, 1, ['action_selection', 'replay_sample'])
+    telemetry.close()
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert 'replay_sample_s' not in records[0]
+    assert records[1]['replay_sample_calls'] == 1
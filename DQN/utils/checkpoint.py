@@ -0,0 +1,127 @@
+import copy
+import glob
+import os
+import random
+import threading
+import numpy as np
+import torch
+
+class CheckpointManager:
+    """Asynchronous, atomic, rotating checkpoints for DQNAgent.
+
+    save() snapshots the agent on the calling thread (an in-memory copy,
+    cheap next to serialization) and hands the write to a background
+    thread. Files are written to a temporary name and renamed into place,
+    so a pre-empted job never leaves a truncated checkpoint behind, and
+    only the newest `keep` checkpoints are kept.
+    """
+
+    def __init__(self, checkpoint_dir="models/checkpoints", keep=3, prefix="ckpt"):
+        if keep < 1:
+            raise ValueError(f"keep must be at least 1, got {keep}")
+        self.checkpoint_dir = checkpoint_dir
+        self.keep = keep
+        self.prefix = prefix
+        self._thread = None
+        self._error = None
+        # Step of the checkpoint restored by the last load()
+        self.loaded_step = None
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _path(self, step):
+        return os.path.join(self.checkpoint_dir, f"{self.prefix}_{step:010d}.pt")
+
+    def list_checkpoints(self):
+        return sorted(glob.glob(os.path.join(self.checkpoint_dir, f"{self.prefix}_*.pt")))
+
+    def latest(self):
+        checkpoints = self.list_checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    @staticmethod
+    def snapshot(agent, include_replay=False, include_rng=True, extra=None):
+        """Consistent in-memory copy of the agent's training state"""
+        state = {
+            'model_state_dict': {k: v.detach().clone() for k, v in agent.model.state_dict().items()},
+            'optimizer_state_dict': copy.deepcopy(agent.optimizer.state_dict()),
+            'epsilon': agent.epsilon
+        }
+        if include_replay and agent.use_replay:
+            state['replay_buffer'] = agent.memory.state_dict()
+        if include_rng:
+            state['rng_state'] = {
+                'python': random.getstate(),
+                'numpy': np.random.get_state(),
+                'torch': torch.get_rng_state()
+            }
+        if extra is not None:
+            state['extra'] = extra
+        return state
+
+    def save(self, agent, step, include_replay=False, include_rng=True, extra=None, blocking=False):
+        """Snapshot now, write in the background (one write in flight at a time)"""
+        state = self.snapshot(agent, include_replay, include_rng, extra)
+        state['step'] = step
+        # A disk-backed replay store persists its own index
+        agent.memory.flush()
+        self.wait()
+
+        self._thread = threading.Thread(target=self._write, args=(state, step), daemon=True)
+        self._thread.start()
+        if blocking:
+            self.wait()
+
+    def _write(self, state, step):
+        try:
+            path = self._path(step)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                torch.save(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._rotate()
+        except Exception as e:
+            self._error = e
+
+    def _rotate(self):
+        for path in self.list_checkpoints()[:-self.keep]:
+            os.remove(path)
+
+    def wait(self):
+        """Block until the pending write finishes, re-raising its error if any"""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def load(self, agent, path=None, restore_rng=True):
+        """Restore the agent from path (default: latest).
+
+        Returns the checkpoint's extra dict ({} if it was saved without one),
+        or None when there is no checkpoint to load.
+        """
+        path = path or self.latest()
+        if path is None:
+            return None
+
+        # weights_only=False: the checkpoint holds NumPy RNG state and replay arrays
+        state = torch.load(path, map_location='cpu', weights_only=False)
+        agent.model.load_state_dict(state['model_state_dict'])
+        agent.optimizer.load_state_dict(state['optimizer_state_dict'])
+        agent.epsilon = state['epsilon']
+
+        if 'replay_buffer' in state and agent.use_replay:
+            agent.memory.load_state_dict(state['replay_buffer'])
+        if restore_rng and 'rng_state' in state:
+            random.setstate(state['rng_state']['python'])
+            np.random.set_state(state['rng_state']['numpy'])
+            torch.set_rng_state(state['rng_state']['torch'])
+
+        # Older checkpoints have no 'step' entry: fall back to the file name
+        self.loaded_step = state.get('step')
+        if self.loaded_step is None:
+            self.loaded_step = int(os.path.basename(path)[len(self.prefix) + 1:-len(".pt")])
+        return state.get('extra', {})
@@ -14,7 +14,11 @@ class TrainingConfig:
         self.epsilon_decay = 0.995
         self.learning_rate = 0.001
         self.batch_size = 32
-        self.memory_size = 100
+        # Replay capacity, same as the original deque(maxlen=2000)
+        self.memory_size = 2000
+        self.prioritized = False
+        self.per_alpha = 0.6
+        self.per_beta = 0.4
         
         # Model
         self.hidden_size = 64
@@ -39,5 +43,16 @@ class ExperimentConfig:
         return {
             'use_replay': True,
             'episodes': 500,
-            'model_path': 'models/dqn_replay.pth'
+            'model_path': 'models/dqn_replay.pth',
+            'memory_size': TrainingConfig().memory_size
+        }
+    
+    @staticmethod
+    def get_prioritized_config():
+        return {
+            'use_replay': True,
+            'episodes': 500,
+            'model_path': 'models/dqn_prioritized.pth',
+            'memory_size': TrainingConfig().memory_size,
+            'prioritized': True
         }
\ No newline at end of file
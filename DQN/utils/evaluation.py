@@ -0,0 +1,75 @@
+import numpy as np
+import torch
+
+# (dx, dy) for UP, DOWN, LEFT, RIGHT, same as GridWorld.step
+MOVES = torch.tensor([[0, -1], [0, 1], [-1, 0], [1, 0]])
+
+def compute_q_map(model, size=5):
+    """Q-values for every (agent, goal) state in one forward pass.
+
+    Returns an array of shape [size, size, size, size, n_actions] indexed
+    as q_map[agent_x, agent_y, goal_x, goal_y, action].
+    """
+    coords = torch.arange(size)
+    grid = torch.stack(torch.meshgrid(coords, coords, coords, coords, indexing='ij'), dim=-1)
+    states = grid.reshape(-1, 4).float()
+    with torch.no_grad():
+        q_values = model(states)
+    return q_values.reshape(size, size, size, size, -1).numpy()
+
+def all_start_goal_pairs(size=5):
+    """Every (start, goal) pair with start != goal, as two [N, 2] tensors"""
+    cells = torch.stack(torch.meshgrid(torch.arange(size), torch.arange(size), indexing='ij'),
+                        dim=-1).reshape(-1, 2)
+    starts = cells.repeat_interleave(len(cells), dim=0)
+    goals = cells.repeat(len(cells), 1)
+    keep = (starts != goals).any(dim=1)
+    return starts[keep], goals[keep]
+
+def evaluate_greedy(model, size=5, max_steps=50, q_map=None):
+    """Run greedy rollouts from every (start, goal) pair in lockstep.
+
+    The greedy policy is read from the Q-map (one forward pass over all
+    states), so every lockstep step is a single batched gather. Returns a
+    report dict and the Q-map.
+    """
+    if q_map is None:
+        q_map = compute_q_map(model, size)
+    greedy = torch.from_numpy(q_map.argmax(axis=-1))
+
+    starts, goals = all_start_goal_pairs(size)
+    pos = starts.clone()
+    n = len(starts)
+    steps = torch.zeros(n, dtype=torch.int64)
+    success = torch.zeros(n, dtype=torch.bool)
+    active = torch.arange(n)
+
+    for _ in range(max_steps):
+        if len(active) == 0:
+            break
+        p, g = pos[active], goals[active]
+        actions = greedy[p[:, 0], p[:, 1], g[:, 0], g[:, 1]]
+        p = (p + MOVES[actions]).clamp_(0, size - 1)
+        pos[active] = p
+        steps[active] += 1
+
+        reached = (p == g).all(dim=1)
+        success[active[reached]] = True
+        active = active[~reached]
+
+    shortest = (starts - goals).abs().sum(dim=1)
+    success_steps = steps[success].numpy()
+    gaps = (steps[success] - shortest[success]).numpy()
+
+    report = {
+        'pairs': n,
+        'success_rate': float(success.float().mean()),
+        'successes': int(success.sum()),
+        'mean_steps': float(success_steps.mean()) if len(success_steps) else float('inf'),
+        'steps_histogram': np.bincount(success_steps, minlength=max_steps + 1).tolist(),
+        'mean_optimality_gap': float(gaps.mean()) if len(gaps) else float('inf'),
+        'optimal_fraction': float((gaps == 0).mean()) if len(gaps) else 0.0,
+        'failed_pairs': [(tuple(s), tuple(g)) for s, g in
+                         zip(starts[~success].tolist(), goals[~success].tolist())]
+    }
+    return report, q_map
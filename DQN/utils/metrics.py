@@ -0,0 +1,6 @@
+"""Re-export of common/metrics.py, shared with Dynamic Programming"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from common.metrics import RollingStats, MetricsRecorder, moving_average
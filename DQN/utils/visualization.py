@@ -1,13 +1,17 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+from utils.metrics import moving_average
 
 class Visualizer:
     def __init__(self, results_dir="results"):
         self.results_dir = results_dir
         os.makedirs(results_dir, exist_ok=True)
     
-    def plot_training_results(self, scores_simple, scores_replay, save_path=None):
+    def plot_training_results(self, scores_simple, scores_replay, save_path=None, show=None):
+        """show=None opens a window only when the plot is not saved"""
+        if show is None:
+            show = save_path is None
         plt.figure(figsize=(12, 5))
         
         # Raw scores
@@ -23,8 +27,8 @@ class Visualizer:
         # Moving averages
         plt.subplot(1, 2, 2)
         window = 50
-        simple_smooth = [np.mean(scores_simple[i:i+window]) for i in range(len(scores_simple)-window)]
-        replay_smooth = [np.mean(scores_replay[i:i+window]) for i in range(len(scores_replay)-window)]
+        simple_smooth = moving_average(scores_simple, window)
+        replay_smooth = moving_average(scores_replay, window)
         
         plt.plot(simple_smooth, label='Sans Replay (moyenne)')
         plt.plot(replay_smooth, label='Avec Replay (moyenne)')
@@ -39,20 +43,40 @@ class Visualizer:
         if save_path:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
         
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close()
     
-    def plot_q_values(self, q_table, save_path=None):
-        """Plot Q-values heatmap for a fixed goal position"""
+    def plot_q_values(self, q_table, save_path=None, show=None, size=5):
+        """Plot max Q-values heatmaps for a few fixed goal positions.
+
+        As in plot_training_results, show=None opens a window only when the
+        plot is not saved.
+
+        q_table is either a dict keyed by (x, y, gx, gy) or a Q-map array of
+        shape [size, size, size, size, n_actions] as built by
+        utils.evaluation.compute_q_map.
+        """
+        if show is None:
+            show = save_path is None
         fig, axes = plt.subplots(2, 2, figsize=(12, 10))
         axes = axes.flatten()
         
-        goal_positions = [(4, 4), (0, 4), (4, 0), (2, 2)]
+        if isinstance(q_table, dict):
+            max_q = lambda gx, gy: np.array([[np.max(q_table.get((x, y, gx, gy), [0]))
+                                              for x in range(size)] for y in range(size)])
+        else:
+            q_table = np.asarray(q_table)
+            size = q_table.shape[0]
+            # q_map[x, y, gx, gy] -> grid indexed [y, x]
+            max_q = lambda gx, gy: q_table[:, :, gx, gy].max(axis=-1).T
+        
+        last = size - 1
+        goal_positions = [(last, last), (0, last), (last, 0), (size // 2, size // 2)]
         
         for idx, (gx, gy) in enumerate(goal_positions):
-            q_grid = np.zeros((5, 5))
-            for x in range(5):
-                for y in range(5):
-                    q_grid[y, x] = np.max(q_table.get((x, y, gx, gy), [0]))
+            q_grid = max_q(gx, gy)
             
             im = axes[idx].imshow(q_grid, cmap='viridis')
             axes[idx].set_title(f'Q-values max - Objectif ({gx}, {gy})')
@@ -65,4 +89,7 @@ class Visualizer:
         if save_path:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
         
-        plt.show()
\ No newline at end of file
+        if show:
+            plt.show()
+        else:
+            plt.close()
\ No newline at end of file
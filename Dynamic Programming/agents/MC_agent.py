@@ -1,34 +1,107 @@
 import numpy as np
 import random
-from collections import defaultdict
+from qstore import make_q_store
+
+def discounted_returns(rewards, gamma, block=256):
+    """G_t = sum_k gamma^k r_{t+k} for every t, as blocked reverse cumulative sums.
+
+    Inside a block G_t = (sum_{j>=t} gamma^j r_j) / gamma^t; blocks are short
+    enough that gamma^t cannot underflow and are chained with the return
+    carried from the block after them.
+    """
+    r = np.asarray(rewards, dtype=float)
+    if gamma == 0:
+        return r.copy()
+    if gamma < 1:
+        block = max(1, min(block, int(-300 / np.log10(gamma))))
+
+    G = np.empty_like(r)
+    carry = 0.0
+    for end in range(len(r), 0, -block):
+        start = max(0, end - block)
+        n = end - start
+        powers = gamma ** np.arange(n)
+        G[start:end] = (np.cumsum((r[start:end] * powers)[::-1])[::-1] / powers
+                        + carry * gamma ** (n - np.arange(n)))
+        carry = G[start]
+    return G
+
+def mc_update(q, counts, keys, returns, visit="first", alpha=None):
+    """Monte Carlo update of flat Q-values and visit counts from one episode.
+
+    keys[t] is the flat index of the (state, action) pair taken at step t
+    and returns[t] its return. Updates q and counts in place.
+    """
+    if visit == "first":
+        # One update per pair, at its first visit: the keys are unique
+        pairs, first = np.unique(keys, return_index=True)
+        counts[pairs] += 1
+        step_size = alpha if alpha is not None else 1.0 / counts[pairs]
+        q[pairs] += step_size * (returns[first] - q[pairs])
+        return
+
+    pairs, group, visits = np.unique(keys, return_inverse=True, return_counts=True)
+    counts[pairs] += visits
+    if alpha is None:
+        # Running mean over all visits: old + (sum G - k * old) / N
+        total = np.bincount(group, weights=returns, minlength=len(pairs))
+        q[pairs] += (total - visits * q[pairs]) / counts[pairs]
+    else:
+        # k sequential constant-alpha updates in episode order, in closed form:
+        # (1 - alpha)^k * old + sum_i alpha * (1 - alpha)^(k - 1 - i) * G_i
+        order = np.argsort(group, kind='stable')
+        rank = np.empty(len(keys), dtype=np.int64)
+        rank[order] = np.arange(len(keys)) - np.repeat(np.cumsum(visits) - visits, visits)
+        decay = 1.0 - alpha
+        weights = alpha * decay ** (visits[group] - 1 - rank) * returns
+        q[pairs] = decay ** visits * q[pairs] + np.bincount(group, weights=weights, minlength=len(pairs))
 
 class MonteCarloAgent:
-    def __init__(self, env, gamma=0.9, epsilon=0.1):
+    """Monte Carlo control with incremental, constant-memory updates.
+
+    visit="first" updates each (state, action) once per episode, at its first
+    visit; visit="every" updates it at every visit. With alpha=None Q is the
+    sample mean of the returns (running mean over visit counts), otherwise a
+    constant-alpha average that tracks non-stationary returns.
+    """
+
+    # update() takes a whole episode, see utils.train_agent
+    episodic = True
+
+    def __init__(self, env, gamma=0.9, epsilon=0.1, visit="first", alpha=None, q_store=None):
+        if visit not in ("first", "every"):
+            raise ValueError(f"visit must be 'first' or 'every', got {visit!r}")
         self.env = env
         self.gamma = gamma
         self.epsilon = epsilon
-        self.Q = defaultdict(lambda: np.zeros(len(env.action_space)))
-        self.returns = defaultdict(list)
-        self.visit_count = defaultdict(lambda: np.zeros(len(env.action_space)))
+        self.visit = visit
+        self.alpha = alpha
+        self.Q = q_store if q_store is not None else make_q_store(env)
+        # Same row layout as Q; int64 so counts stay exact past 2**24 visits
+        self.visit_count = np.zeros((len(self.Q.table), len(env.action_space)), dtype=np.int64)
+        self.actions = list(env.action_space)
+        self.action_index = {action: i for i, action in enumerate(self.actions)}
         self.name = "Monte Carlo"
-    
+
     def act(self, state):
         if random.random() < self.epsilon:
-            return random.choice(self.env.action_space)
+            return random.choice(self.actions)
         else:
-            state_actions = self.Q[state]
-            return self.env.action_space[np.argmax(state_actions)]
-    
+            return self.actions[int(self.Q[state].argmax())]
+
     def update(self, episode):
         states, actions, rewards = zip(*episode)
-        G = 0
-        
-        for t in range(len(episode)-1, -1, -1):
-            state, action, reward = episode[t]
-            G = self.gamma * G + reward
-            
-            if (state, action) not in [(s, a) for s, a, _ in episode[:t]]:
-                action_idx = self.env.action_space.index(action)
-                self.returns[(state, action)].append(G)
-                self.Q[state][action_idx] = np.mean(self.returns[(state, action)])
-                self.visit_count[state][action_idx] += 1
\ No newline at end of file
+        returns = discounted_returns(rewards, self.gamma)
+
+        # Flat (state, action) keys into the [S, A] tables
+        A = len(self.actions)
+        rows = self.Q.rows_of(states)
+        keys = rows * A + np.fromiter((self.action_index[a] for a in actions), dtype=np.int64,
+                                      count=len(actions))
+        if len(self.Q.table) > len(self.visit_count):
+            grown = np.zeros(self.Q.table.shape, dtype=np.int64)
+            grown[:len(self.visit_count)] = self.visit_count
+            self.visit_count = grown
+        q, counts = self.Q.table.reshape(-1), self.visit_count.reshape(-1)
+
+        mc_update(q, counts, keys, returns, self.visit, self.alpha)
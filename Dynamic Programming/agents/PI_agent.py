@@ -1,88 +1,106 @@
 import numpy as np
-import random
+from mdp import compile_model
 
 class PolicyIterationAgent:
-    def __init__(self, env, gamma=0.9):
+    """Policy Iteration with a selectable policy evaluation backend.
+
+    evaluation="exact"     solves (I - gamma * P_pi) v = r_pi with a sparse solver
+    evaluation="modified"  runs `sweeps` vectorized backups (modified policy iteration);
+                           once the policy is stable it keeps evaluating until the
+                           change drops below theta
+    evaluation="iterative" runs vectorized backups until the change drops below theta
+    """
+
+    EVALUATIONS = ("exact", "modified", "iterative")
+
+    def __init__(self, env, gamma=0.9, evaluation="exact", sweeps=20, theta=1e-6, model=None):
+        if evaluation not in self.EVALUATIONS:
+            raise ValueError(f"evaluation must be one of {self.EVALUATIONS}, got {evaluation!r}")
         self.env = env
         self.gamma = gamma
-        self.values = np.zeros(env.grid_size)
-        self.policy = {state: random.choice(env.action_space) 
-                      for state in env.get_all_states() 
-                      if state != env.terminal_state}
-        self.policy[env.terminal_state] = None
+        self.evaluation = evaluation
+        self.sweeps = sweeps
+        self.theta = theta
+        self.model = model if model is not None else compile_model(env)
+        self.values = np.zeros(self.model.shape)
+
+        policy = np.random.randint(self.model.n_actions, size=self.model.n_states)
+        policy[self.model.terminal] = -1
+        self.policy_indices = policy.reshape(self.model.shape)
+        self._policy = None
+
         self.name = "Policy Iteration"
         self._learn()
-    
+
     def _learn(self):
         iteration = 0
-        policy_stable = False
-        
-        while not policy_stable:
-            self._policy_evaluation()
+
+        while True:
+            delta = self._policy_evaluation()
             policy_stable = self._policy_improvement()
             iteration += 1
-        
+            # Modified PI: a stable policy after partial sweeps only stops once
+            # its values have converged too
+            if policy_stable and delta < self.theta:
+                break
+
         print(f"Policy Iteration terminée en {iteration} itérations")
-    
+
     def _policy_evaluation(self):
-        while True:
-            delta = 0
-            for i in range(4):
-                for j in range(4):
-                    state = (i, j)
-                    if state == self.env.terminal_state:
-                        continue
-                    
-                    action = self.policy[state]
-                    next_state = self._get_next_state(state, action)
-                    reward = self.env.rewards[next_state]
-                    
-                    new_value = reward + self.gamma * self.values[next_state]
-                    delta = max(delta, abs(new_value - self.values[state]))
-                    self.values[state] = new_value
-            
-            if delta < 1e-6:
-                break
-    
+        """Evaluate the current policy into self.values, returns the last change"""
+        P, rewards = self.model.policy_matrix(self.policy_indices)
+
+        if self.evaluation == "exact":
+            from scipy.sparse import identity
+            from scipy.sparse.linalg import spsolve
+
+            n = self.model.n_states
+            v = spsolve((identity(n, format='csr') - self.gamma * P).tocsc(), rewards)
+            delta = 0.0
+        else:
+            v = self.values.ravel().copy()
+            sweep = 0
+            while True:
+                new_v = rewards + self.gamma * (P @ v)
+                delta = np.abs(new_v - v).max()
+                v = new_v
+                sweep += 1
+                if self.evaluation == "modified" and sweep >= self.sweeps:
+                    break
+                if delta < self.theta:
+                    break
+
+        self.values = v.reshape(self.model.shape)
+        return delta
+
     def _policy_improvement(self):
-        policy_stable = True
-        
-        for i in range(4):
-            for j in range(4):
-                state = (i, j)
-                if state == self.env.terminal_state:
-                    continue
-                
-                old_action = self.policy[state]
-                
-                best_action = None
-                best_value = -float('inf')
-                
-                for action in self.env.action_space:
-                    next_state = self._get_next_state(state, action)
-                    reward = self.env.rewards[next_state]
-                    value = reward + self.gamma * self.values[next_state]
-                    
-                    if value > best_value:
-                        best_value = value
-                        best_action = action
-                
-                self.policy[state] = best_action
-                
-                if old_action != best_action:
-                    policy_stable = False
-        
+        q = self.model.q_values(self.values, self.gamma)
+        best = q.argmax(axis=0)
+
+        # Keep the current action when it is already optimal, so ties cannot cycle
+        old = self.policy_indices.ravel()
+        old_q = q[np.maximum(old, 0), np.arange(len(old))]
+        keep = (old >= 0) & (old_q >= q.max(axis=0) - 1e-12)
+        new_policy = np.where(keep, old, best)
+        new_policy[self.model.terminal] = -1
+
+        policy_stable = np.array_equal(new_policy, old)
+        self.policy_indices = new_policy.reshape(self.model.shape)
+        self._policy = None
         return policy_stable
-    
-    def _get_next_state(self, state, action):
-        move = self.env.actions[action]
-        return (
-            max(0, min(3, state[0] + move[0])),
-            max(0, min(3, state[1] + move[1]))
-        )
-    
+
+    @property
+    def policy(self):
+        """Dict view {state: action} of the current policy, built on first access"""
+        if self._policy is None:
+            actions = self.model.actions
+            self._policy = {state: (actions[a] if a >= 0 else None)
+                            for state, a in np.ndenumerate(self.policy_indices)}
+        return self._policy
+
     def act(self, state):
-        return self.policy[state]
-    
+        a = self.policy_indices[tuple(state)]
+        return self.model.actions[a] if a >= 0 else None
+
     def update(self, state, action, reward, next_state, done):
-        pass
\ No newline at end of file
+        pass
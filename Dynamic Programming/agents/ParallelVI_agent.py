@@ -0,0 +1,181 @@
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+import numpy as np
+from bellman import shift
+from VI_agent import ValueIterationAgent
+
+def _action_mix(env):
+    """Distinct moves and the [A, M] probability of each move under each action"""
+    moves = [env.actions[action] for action in env.action_space]
+    if env.deterministic:
+        return moves, np.eye(len(moves))
+    # GridEnv.step ignores the chosen action and samples a move uniformly
+    return moves, np.full((len(moves), len(moves)), 1.0 / len(moves))
+
+def _stripe_q_values(target, moves, mix):
+    """Q-values of every action on a block of target, one shift per move"""
+    shifted = [shift(target, move) for move in moves]
+    for weights in mix:
+        q = None
+        for m in np.flatnonzero(weights):
+            term = shifted[m] if weights[m] == 1.0 else weights[m] * shifted[m]
+            q = term if q is None else q + term
+        yield q
+
+def _attach(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _stripe_worker(worker, rows, names, shape, n_workers, gamma, theta, moves, mix,
+                   terminal, barrier):
+    """Jacobi value iteration on rows [rows[0], rows[1]) of the shared grid.
+
+    Each iteration reads the stripe plus one halo row on each side from the
+    current value buffer, writes the stripe into the other buffer and its
+    largest change into deltas. After the barrier every worker reads all the
+    deltas, so all of them take the same stop decision.
+    """
+    handles = []
+    try:
+        shm, values = _attach(names['values'], (2,) + shape, np.float64)
+        handles.append(shm)
+        shm, rewards = _attach(names['rewards'], shape, np.float64)
+        handles.append(shm)
+        shm, deltas = _attach(names['deltas'], (2, n_workers), np.float64)
+        handles.append(shm)
+        shm, policy = _attach(names['policy'], shape, np.int64)
+        handles.append(shm)
+        shm, meta = _attach(names['meta'], (1,), np.int64)
+        handles.append(shm)
+
+        r0, r1 = rows
+        lo, hi = max(r0 - 1, 0), min(r1 + 1, shape[0])
+        inner = slice(r0 - lo, r1 - lo)
+        owns_terminal = r0 <= terminal[0] < r1
+        local_terminal = (terminal[0] - r0, terminal[1])
+
+        k = 0
+        while True:
+            current, following = values[k % 2], values[(k + 1) % 2]
+            target = rewards[lo:hi] + gamma * current[lo:hi]
+            best = None
+            for q in _stripe_q_values(target, moves, mix):
+                best = q.copy() if best is None else np.maximum(best, q, out=best)
+            new = best[inner]
+            if owns_terminal:
+                new[local_terminal] = 0.0
+
+            deltas[k % 2, worker] = np.abs(new - current[r0:r1]).max()
+            following[r0:r1] = new
+            barrier.wait()
+            k += 1
+            if deltas[(k - 1) % 2].max() < theta:
+                break
+
+        # Greedy policy of the stripe from the final values
+        target = rewards[lo:hi] + gamma * values[k % 2][lo:hi]
+        best = None
+        for a, q in enumerate(_stripe_q_values(target, moves, mix)):
+            q = q[inner]
+            if best is None:
+                best, best_action = q.copy(), np.zeros(q.shape, dtype=np.int64)
+            else:
+                better = q > best
+                best = np.where(better, q, best)
+                best_action[better] = a
+        if owns_terminal:
+            best_action[local_terminal] = -1
+        policy[r0:r1] = best_action
+        if worker == 0:
+            meta[0] = k
+    except BrokenBarrierError:
+        return
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        for shm in handles:
+            shm.close()
+
+class ParallelValueIterationAgent(ValueIterationAgent):
+    """Value Iteration on a GridEnv split into row stripes across processes.
+
+    The value grid lives in multiprocessing.shared_memory (double-buffered).
+    Each worker backs up its stripe with array shifts, reading one halo row
+    from its neighbours after the barrier that ends each iteration. Values,
+    iterations and policy are identical to the synchronous sweeps of
+    ValueIterationAgent, and the same values / policy / act interface is exposed.
+    No transition matrix is built, so memory stays O(rows * cols).
+    """
+
+    def __init__(self, env, gamma=0.9, theta=1e-6, workers=None):
+        if not hasattr(env, 'grid_size'):
+            raise ValueError("ParallelValueIterationAgent needs a GridEnv")
+        self.env = env
+        self.gamma = gamma
+        self.theta = theta
+        self.mode = "sync"
+        self.model = None
+        self.actions = list(env.action_space)
+        rows = env.grid_size[0]
+        self.workers = max(1, min(workers or os.cpu_count() or 1, rows))
+        self.values = np.zeros(env.grid_size)
+        self.policy_indices = np.full(env.grid_size, -1, dtype=np.int64)
+        self._policy = None
+        self.name = "Value Iteration"
+        self._learn()
+
+    def _learn(self):
+        shape = tuple(self.env.grid_size)
+        n = self.workers
+        bounds = np.linspace(0, shape[0], n + 1).astype(int)
+        moves, mix = _action_mix(self.env)
+
+        layout = {
+            'values': ((2,) + shape, np.float64),
+            'rewards': (shape, np.float64),
+            'deltas': ((2, n), np.float64),
+            'policy': (shape, np.int64),
+            'meta': ((1,), np.int64),
+        }
+        blocks, arrays = {}, {}
+        try:
+            for key, (block_shape, dtype) in layout.items():
+                size = int(np.prod(block_shape)) * np.dtype(dtype).itemsize
+                blocks[key] = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                arrays[key] = np.ndarray(block_shape, dtype=dtype, buffer=blocks[key].buf)
+            arrays['values'][:] = 0.0
+            arrays['rewards'][:] = self.env.rewards
+            arrays['deltas'][:] = np.inf
+            names = {key: shm.name for key, shm in blocks.items()}
+
+            ctx = mp.get_context('spawn')
+            barrier = ctx.Barrier(n)
+            processes = [
+                ctx.Process(target=_stripe_worker,
+                            args=(w, (bounds[w], bounds[w + 1]), names, shape, n, self.gamma,
+                                  self.theta, moves, mix, tuple(self.env.terminal_state), barrier))
+                for w in range(n)
+            ]
+            for p in processes:
+                p.start()
+            for p in processes:
+                p.join()
+            failed = [p.exitcode for p in processes if p.exitcode != 0]
+            if failed:
+                raise RuntimeError(f"Value Iteration: {len(failed)} worker(s) failed (exit codes {failed})")
+
+            iteration = int(arrays['meta'][0])
+            self.values = arrays['values'][iteration % 2].copy()
+            self.policy_indices = arrays['policy'].copy()
+        finally:
+            arrays.clear()
+            for shm in blocks.values():
+                shm.close()
+                shm.unlink()
+
+        self.backups = iteration * self.values.size
+        self._policy = None
+        print(f"Value Iteration ({n} processus) terminée en {iteration} itérations")
@@ -1,29 +1,33 @@
 import numpy as np
 import random
-from collections import defaultdict
+from qstore import make_q_store
 
 class QLearningAgent:
-    def __init__(self, env, gamma=0.9, alpha=0.1, epsilon=0.1):
+    def __init__(self, env, gamma=0.9, alpha=0.1, epsilon=0.1, q_store=None):
         self.env = env
         self.gamma = gamma
         self.alpha = alpha
         self.epsilon = epsilon
-        self.Q = defaultdict(lambda: np.zeros(len(env.action_space)))
+        self.Q = q_store if q_store is not None else make_q_store(env)
+        self.actions = list(env.action_space)
+        self.action_index = {action: i for i, action in enumerate(self.actions)}
         self.name = "Q-Learning"
-    
+
     def act(self, state):
         if random.random() < self.epsilon:
-            return random.choice(self.env.action_space)
+            return random.choice(self.actions)
         else:
-            return self.env.action_space[np.argmax(self.Q[state])]
-    
+            return self.actions[int(self.Q[state].argmax())]
+
     def update(self, state, action, reward, next_state, done):
-        action_idx = self.env.action_space.index(action)
-        current_q = self.Q[state][action_idx]
-        
+        a = self.action_index[action]
+        s = self.Q.row(state)
+
         if done:
             target = reward
         else:
-            target = reward + self.gamma * np.max(self.Q[next_state])
-        
-        self.Q[state][action_idx] = current_q + self.alpha * (target - current_q)
\ No newline at end of file
+            n = self.Q.row(next_state)
+            target = reward + self.gamma * float(self.Q.table[n].max())
+
+        q = self.Q.table
+        q[s, a] += self.alpha * (target - q[s, a])
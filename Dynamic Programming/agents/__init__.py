@@ -0,0 +1,55 @@
+"""Registre paresseux des agents : une classe n'est importée qu'à sa première utilisation.
+
+    from agents import QLearningAgent      # importe QL_agent seulement
+    get_agent("vi")                        # alias courts du menu de main.py
+"""
+import importlib
+import os
+import sys
+
+# Les modules d'agents s'importent entre eux par leur nom nu (from mdp import ...)
+_AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _AGENTS_DIR not in sys.path:
+    sys.path.append(_AGENTS_DIR)
+
+# Nom de classe -> module du dossier agents
+_REGISTRY = {
+    'RandomAgent': 'Random_agent',
+    'ValueIterationAgent': 'VI_agent',
+    'ParallelValueIterationAgent': 'ParallelVI_agent',
+    'PolicyIterationAgent': 'PI_agent',
+    'MonteCarloAgent': 'MC_agent',
+    'QLearningAgent': 'QL_agent',
+}
+
+ALIASES = {
+    'random': 'RandomAgent',
+    'vi': 'ValueIterationAgent',
+    'pvi': 'ParallelValueIterationAgent',
+    'pi': 'PolicyIterationAgent',
+    'mc': 'MonteCarloAgent',
+    'q': 'QLearningAgent',
+}
+
+__all__ = list(_REGISTRY) + ['get_agent', 'available_agents']
+
+def available_agents():
+    return list(_REGISTRY)
+
+def get_agent(name):
+    """Classe d'agent pour un nom de classe ou un alias (random, vi, pvi, pi, mc, q)"""
+    class_name = ALIASES.get(name, name)
+    if class_name not in _REGISTRY:
+        raise KeyError(f"Agent inconnu: {name!r} (disponibles: {', '.join(list(ALIASES) + list(_REGISTRY))})")
+    module = importlib.import_module(_REGISTRY[class_name])
+    return getattr(module, class_name)
+
+def __getattr__(name):
+    if name in _REGISTRY:
+        agent_class = get_agent(name)
+        globals()[name] = agent_class
+        return agent_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_REGISTRY))
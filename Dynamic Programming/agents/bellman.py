@@ -0,0 +1,57 @@
+import numpy as np
+
+def shift(grid, move):
+    """grid[clip(i + di), clip(j + dj)] for every cell, as array slices.
+
+    This is the value of the successor cell under a deterministic move,
+    with moves into a wall leaving the agent in place.
+    """
+    di, dj = move
+    if (di, dj) == (0, 0):
+        return grid.copy()
+    if di != 0 and dj != 0 or abs(di) > 1 or abs(dj) > 1:
+        rows, cols = grid.shape
+        r = np.clip(np.arange(rows) + di, 0, rows - 1)
+        c = np.clip(np.arange(cols) + dj, 0, cols - 1)
+        return grid[np.ix_(r, c)]
+
+    out = np.empty_like(grid)
+    if di == 1:
+        out[:-1] = grid[1:]
+        out[-1] = grid[-1]
+    elif di == -1:
+        out[1:] = grid[:-1]
+        out[0] = grid[0]
+    elif dj == 1:
+        out[:, :-1] = grid[:, 1:]
+        out[:, -1] = grid[:, -1]
+    else:
+        out[:, 1:] = grid[:, :-1]
+        out[:, 0] = grid[:, 0]
+    return out
+
+def backup_target(rewards, values, gamma):
+    """r(s') + gamma * V(s'): GridEnv rewards depend only on the next state"""
+    return rewards + gamma * values
+
+def action_values(target, moves):
+    """[A, rows, cols] array of Q(s, a) = target[next(s, a)]"""
+    return np.stack([shift(target, move) for move in moves])
+
+def bellman_max(target, moves):
+    """max_a Q(s, a), accumulated in place without stacking the actions"""
+    best = shift(target, moves[0])
+    for move in moves[1:]:
+        np.maximum(best, shift(target, move), out=best)
+    return best
+
+def greedy_actions(target, moves):
+    """Index of the first maximizing action in every cell"""
+    best = shift(target, moves[0])
+    best_action = np.zeros(target.shape, dtype=np.int64)
+    for a, move in enumerate(moves[1:], 1):
+        q = shift(target, move)
+        better = q > best
+        best = np.where(better, q, best)
+        best_action[better] = a
+    return best_action
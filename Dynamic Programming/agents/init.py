@@ -1,13 +0,0 @@
-from .random_agent import RandomAgent
-from .value_iteration_agent import ValueIterationAgent
-from .policy_iteration_agent import PolicyIterationAgent
-from .monte_carlo_agent import MonteCarloAgent
-from .q_learning_agent import QLearningAgent
-
-__all__ = [
-    'RandomAgent',
-    'ValueIterationAgent', 
-    'PolicyIterationAgent',
-    'MonteCarloAgent',
-    'QLearningAgent'
-]
\ No newline at end of file
@@ -0,0 +1,214 @@
+import numpy as np
+from bellman import backup_target, action_values, bellman_max, greedy_actions
+
+class TabularMDP:
+    """Compiled finite MDP shared by the planners.
+
+    States are flat indices into `shape`. The transitions of all actions are
+    stacked in one CSR matrix P of shape [A * S, S], row a * S + s holding
+    P(s' | s, a), so a full Bellman backup is a single sparse mat-vec. R has
+    the matching [A, S] layout: R[a, s] is the expected immediate reward.
+    Terminal states are absorbing: their rows are empty and their rewards
+    zero, so their value stays 0.
+    """
+
+    def __init__(self, shape, P, R, terminal, actions):
+        self.shape = tuple(shape)
+        self.n_states = int(np.prod(self.shape))
+        self.n_actions = len(actions)
+        self.P = P
+        self.R = R
+        self.terminal = terminal
+        self.actions = list(actions)
+        self._predecessors = None
+
+    def predecessors(self):
+        """Reverse index (indptr, states, probs), built once.
+
+        The predecessors of s' are states[indptr[s']:indptr[s' + 1]], each
+        with max_a P(s' | s, a) in probs.
+        """
+        if self._predecessors is None:
+            S = self.n_states
+            coo = self.P.tocoo()
+            succ, pred, prob = coo.col, coo.row % S, coo.data
+
+            # Sort by successor, predecessor, then decreasing probability and
+            # keep the first entry of each (successor, predecessor) pair
+            order = np.lexsort((-prob, pred, succ))
+            succ, pred, prob = succ[order], pred[order], prob[order]
+            first = np.ones(len(succ), dtype=bool)
+            first[1:] = (succ[1:] != succ[:-1]) | (pred[1:] != pred[:-1])
+            succ, pred, prob = succ[first], pred[first], prob[first]
+
+            indptr = np.zeros(S + 1, dtype=np.int64)
+            np.cumsum(np.bincount(succ, minlength=S), out=indptr[1:])
+            self._predecessors = (indptr, pred, prob)
+        return self._predecessors
+
+    def action_matrix(self, a):
+        """[S, S] transition matrix of action a"""
+        S = self.n_states
+        return self.P[a * S:(a + 1) * S]
+
+    def index(self, state):
+        return int(np.ravel_multi_index(tuple(state), self.shape))
+
+    def q_values(self, values, gamma):
+        """[A, S] array of R[a, s] + gamma * sum_s' P(s' | s, a) V(s')"""
+        expected = (self.P @ np.ravel(values)).reshape(self.n_actions, self.n_states)
+        return self.R + gamma * expected
+
+    def backup(self, values, gamma):
+        """max_a Q(s, a) for every state"""
+        return self.q_values(values, gamma).max(axis=0)
+
+    def greedy(self, values, gamma):
+        """Index of the first maximizing action per state, -1 on terminal states"""
+        policy = self.q_values(values, gamma).argmax(axis=0)
+        policy[self.terminal] = -1
+        return policy
+
+    def policy_matrix(self, policy):
+        """[S, S] transitions and [S] rewards of a deterministic policy (action indices)"""
+        policy = np.maximum(np.ravel(policy), 0)
+        states = np.arange(self.n_states)
+        return self.P[policy * self.n_states + states], self.R[policy, states]
+
+class GridShiftMDP(TabularMDP):
+    """Deterministic GridEnv model whose backups use array shifts instead of P.
+
+    P and R are still built, for policy evaluation and other consumers, but
+    the value-iteration kernels only shift the reward-plus-value grid.
+    """
+
+    def __init__(self, shape, P, R, terminal, actions, rewards, moves):
+        super().__init__(shape, P, R, terminal, actions)
+        self.rewards = rewards
+        self.moves = moves
+
+    def _target(self, values, gamma):
+        return backup_target(self.rewards, np.reshape(values, self.shape), gamma)
+
+    def q_values(self, values, gamma):
+        q = action_values(self._target(values, gamma), self.moves).reshape(self.n_actions, -1)
+        q[:, self.terminal] = 0.0
+        return q
+
+    def backup(self, values, gamma):
+        best = bellman_max(self._target(values, gamma), self.moves).ravel()
+        best[self.terminal] = 0.0
+        return best
+
+    def greedy(self, values, gamma):
+        policy = greedy_actions(self._target(values, gamma), self.moves).ravel()
+        policy[self.terminal] = -1
+        return policy
+
+def _compile(shape, actions, outcomes, terminal, model=TabularMDP, **extra):
+    """Assemble a TabularMDP from per-action outcome lists.
+
+    outcomes[a] is a list of (prob, next_state, reward) triples where prob
+    is a scalar and next_state / reward are [S] arrays. Duplicate successors
+    (e.g. two moves blocked by the same wall) are summed by the CSR build.
+    """
+    from scipy.sparse import csr_matrix
+
+    S = int(np.prod(shape))
+    A = len(actions)
+    states = np.arange(S)
+    live = ~terminal
+
+    rows, cols, probs = [], [], []
+    R = np.zeros((A, S))
+    for a, outcome in enumerate(outcomes):
+        for prob, next_state, reward in outcome:
+            rows.append(a * S + states[live])
+            cols.append(next_state[live])
+            probs.append(np.full(live.sum(), prob))
+            R[a, live] += prob * reward[live]
+
+    P = csr_matrix((np.concatenate(probs), (np.concatenate(rows), np.concatenate(cols))),
+                   shape=(A * S, S))
+    P.sum_duplicates()
+    return model(shape, P, R, terminal, actions, **extra)
+
+def compile_grid_env(env):
+    """Model of a GridEnv: r(s') on arrival, uniform random moves when not deterministic"""
+    rows, cols = env.grid_size
+    shape = (rows, cols)
+    i, j = (x.ravel() for x in np.indices(shape))
+    grid_rewards = np.asarray(env.rewards, dtype=float)
+    rewards = grid_rewards.ravel()
+
+    terminal = np.zeros(rows * cols, dtype=bool)
+    terminal[np.ravel_multi_index(env.terminal_state, shape)] = True
+
+    moves = [env.actions[action] for action in env.action_space]
+    successors = []
+    for di, dj in moves:
+        next_state = np.clip(i + di, 0, rows - 1) * cols + np.clip(j + dj, 0, cols - 1)
+        successors.append((next_state, rewards[next_state]))
+
+    if env.deterministic:
+        outcomes = [[(1.0, s, r)] for s, r in successors]
+        return _compile(shape, env.action_space, outcomes, terminal,
+                        model=GridShiftMDP, rewards=grid_rewards, moves=moves)
+
+    # GridEnv.step ignores the chosen action and samples a move uniformly
+    p = 1.0 / len(successors)
+    outcomes = [[(p, s, r) for s, r in successors]] * len(successors)
+    return _compile(shape, env.action_space, outcomes, terminal)
+
+def compile_gw(env):
+    """Model of a Gymnasium GW with its current goals and (static) obstacles.
+
+    States are indexed by (x, y) over (grid_width, grid_height). Truncation
+    by max_steps is not part of the model.
+    """
+    if env.obstacles_move:
+        raise ValueError("GW with moving obstacles is not a fixed MDP over agent positions")
+    width, height = env.grid_width, env.grid_height
+    shape = (width, height)
+    x, y = (v.ravel() for v in np.indices(shape))
+    here = x * height + y
+
+    terminal = np.zeros(width * height, dtype=bool)
+    goal = np.zeros(width * height, dtype=bool)
+    for gx, gy in env.terminal_states:
+        terminal[gx * height + gy] = goal[gx * height + gy] = True
+    obstacle = np.zeros(width * height, dtype=bool)
+    for ox, oy in env.obstacles:
+        obstacle[ox * height + oy] = True
+
+    # Same action order as GW.step: up, down, right, left
+    moves = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+    outcomes = []
+    for dx, dy in moves:
+        target = np.clip(x + dx, 0, width - 1) * height + np.clip(y + dy, 0, height - 1)
+        blocked = obstacle[target]
+        next_state = np.where(blocked, here, target)
+        reward = np.where(blocked, env.obstacle_penalty,
+                 np.where(goal[target], env.goal_reward,
+                 np.where(target != here, env.step_penalty, env.wall_penalty)))
+        outcomes.append([(1.0, next_state, reward.astype(float))])
+    return _compile(shape, list(range(4)), outcomes, terminal)
+
+def _model_key(env):
+    if hasattr(env, 'grid_width'):
+        return ('gw', env.grid_width, env.grid_height, tuple(map(tuple, env.terminal_states)),
+                tuple(map(tuple, env.obstacles)), env.goal_reward, env.step_penalty,
+                env.wall_penalty, env.obstacle_penalty, env.obstacles_move)
+    rewards = np.asarray(env.rewards, dtype=float)
+    return ('grid_env', env.deterministic, tuple(env.grid_size), tuple(env.terminal_state),
+            hash(rewards.tobytes()))
+
+def compile_model(env):
+    """Compiled model of a GridEnv or GW, cached on the env until its configuration changes"""
+    key = _model_key(env)
+    cached = getattr(env, '_mdp_model', None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    model = compile_gw(env) if key[0] == 'gw' else compile_grid_env(env)
+    env._mdp_model = (key, model)
+    return model
@@ -0,0 +1,77 @@
+import numpy as np
+
+class DenseQStore:
+    """Q-table of a known rows x cols grid as one contiguous [S, A] array.
+
+    States (i, j) map to row i * cols + j, so a lookup is two integer
+    operations with no hashing and the whole table is allocated up front.
+    """
+
+    def __init__(self, grid_size, n_actions, dtype=np.float32):
+        self.rows, self.cols = grid_size
+        self.n_actions = n_actions
+        self.table = np.zeros((self.rows * self.cols, n_actions), dtype=dtype)
+
+    def row(self, state):
+        i, j = state
+        return i * self.cols + j
+
+    def rows_of(self, states):
+        """Rows of a sequence of states as an int64 array"""
+        cells = np.asarray(states, dtype=np.int64).reshape(-1, 2)
+        return cells[:, 0] * self.cols + cells[:, 1]
+
+    def __getitem__(self, state):
+        return self.table[self.row(state)]
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+class HashQStore:
+    """Q-table for state spaces not known in advance.
+
+    States are assigned rows in insertion order through a single dict
+    (itself an open-addressing table) and the values live in one contiguous
+    [capacity, A] array that doubles when full. `table` is replaced on
+    growth, so read it again after calling row() on a new state.
+    """
+
+    def __init__(self, n_actions, capacity=1024, dtype=np.float32):
+        self.n_actions = n_actions
+        self.index = {}
+        self.table = np.zeros((capacity, n_actions), dtype=dtype)
+
+    def row(self, state):
+        index = self.index.get(state)
+        if index is None:
+            index = self.index[state] = len(self.index)
+            if index == len(self.table):
+                grown = np.zeros((2 * len(self.table), self.n_actions), dtype=self.table.dtype)
+                grown[:index] = self.table
+                self.table = grown
+        return index
+
+    def rows_of(self, states):
+        """Rows of a sequence of states as an int64 array"""
+        return np.fromiter((self.row(state) for state in states), dtype=np.int64, count=len(states))
+
+    def __getitem__(self, state):
+        return self.table[self.row(state)]
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+def make_q_store(env, dtype=np.float32):
+    """Dense store for grid envs with a known size, hash store otherwise"""
+    n_actions = len(env.action_space)
+    if hasattr(env, 'grid_size'):
+        return DenseQStore(env.grid_size, n_actions, dtype)
+    return HashQStore(n_actions, dtype=dtype)
@@ -1,42 +1,61 @@
+from collections import deque
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+
+def default_rewards(grid_size, terminal_state):
+    """+1 sur l'objectif, -0.1 sur (1,1) et (2,2) quand elles sont dans la grille"""
+    rewards = np.zeros(grid_size)
+    rewards[terminal_state] = 1.0
+    for cell in [(1, 1), (2, 2)]:
+        if cell != terminal_state and cell[0] < grid_size[0] and cell[1] < grid_size[1]:
+            rewards[cell] = -0.1
+    return rewards
 
 class GridEnv:
-    def __init__(self, deterministic=False):
-        self.grid_size = (4, 4)
-        self.terminal_state = (3, 3)
+    """Grille 2D ; matplotlib n'est importé qu'au premier render().
+
+    max_history=None garde tout le chemin parcouru dans self.history, un
+    entier ne garde que les max_history dernières positions (épisodes longs).
+    """
+
+    def __init__(self, deterministic=False, grid_size=(4, 4), terminal_state=None, rewards=None,
+                 max_history=None):
+        if rewards is not None:
+            rewards = np.asarray(rewards, dtype=float)
+            grid_size = rewards.shape
+        self.grid_size = tuple(grid_size)
+        self.terminal_state = tuple(terminal_state) if terminal_state is not None else (self.grid_size[0] - 1, self.grid_size[1] - 1)
         self.current_state = (0, 0)
-        self.history = []
+        self.max_history = max_history
+        self.history = self._new_history()
         self.deterministic = deterministic
         
-        # Grille de rewards
-        self.rewards = np.zeros(self.grid_size)
-        self.rewards[self.terminal_state] = 1.0
-        self.rewards[1, 1] = -0.1
-        self.rewards[2, 2] = -0.1
+        # Grille de rewards (par défaut : +1 sur l'objectif, -0.1 sur (1,1) et (2,2))
+        self.rewards = rewards if rewards is not None else default_rewards(self.grid_size, self.terminal_state)
         
         # Actions possibles
         self.actions = {'up': (-1,0), 'down': (1,0), 'left': (0,-1), 'right': (0,1)}
         self.action_space = list(self.actions.keys())
         
-        # Initialisation de la visualisation
+        # Visualisation créée au premier render()
+        self.renderer = None
         self.fig, self.ax = None, None
-        self.init_visualization()
     
-    def init_visualization(self):
-        self.fig, self.ax = plt.subplots(figsize=(8, 8))
-        self.ax.set_xlim(-0.5, 3.5)
-        self.ax.set_ylim(-0.5, 3.5)
-        self.ax.set_xticks(range(4))
-        self.ax.set_yticks(range(4))
-        self.ax.grid(True)
-        self.ax.set_aspect('equal')
-        self.ax.set_title('Grid World - Reinforcement Learning', fontsize=16)
+    def _new_history(self):
+        return [] if self.max_history is None else deque(maxlen=self.max_history)
+    
+    def init_visualization(self, offscreen=False, **renderer_kwargs):
+        """Crée le renderer (figure et grille dessinées une seule fois), voir renderer.py"""
+        from renderer import GridRenderer
+        if self.renderer is not None:
+            self.renderer.close()
+        self.renderer = GridRenderer(self, offscreen=offscreen, **renderer_kwargs)
+        self.fig, self.ax = self.renderer.fig, self.renderer.ax
+        return self.renderer
     
     def reset(self):
         self.current_state = (0, 0)
-        self.history = [self.current_state]
+        self.history = self._new_history()
+        self.history.append(self.current_state)
         return self.current_state
     
     def step(self, action):
@@ -47,8 +66,8 @@ class GridEnv:
             move = random.choice(list(self.actions.values()))
             
         new_state = (
-            max(0, min(3, self.current_state[0] + move[0])),
-            max(0, min(3, self.current_state[1] + move[1]))
+            max(0, min(self.grid_size[0] - 1, self.current_state[0] + move[0])),
+            max(0, min(self.grid_size[1] - 1, self.current_state[1] + move[1]))
         )
         
         reward = self.rewards[new_state]
@@ -59,52 +78,76 @@ class GridEnv:
         return new_state, reward, done, {}
     
     def get_all_states(self):
-        return [(i, j) for i in range(4) for j in range(4)]
+        return [(i, j) for i in range(self.grid_size[0]) for j in range(self.grid_size[1])]
     
     def render(self, show_path=True, delay=0.5):
-        self.ax.clear()
-        
-        # Dessiner la grille
-        for i in range(4):
-            for j in range(4):
-                if (i, j) == self.terminal_state:
-                    color = 'lightgreen'
-                elif self.rewards[i, j] < 0:
-                    color = 'lightcoral'
-                else:
-                    color = 'lightblue'
-                
-                rect = patches.Rectangle((j-0.5, i-0.5), 1, 1, 
-                                       linewidth=2, edgecolor='black', 
-                                       facecolor=color, alpha=0.7)
-                self.ax.add_patch(rect)
-                
-                reward_text = f"{self.rewards[i, j]:.1f}"
-                self.ax.text(j, i, reward_text, ha='center', va='center', 
-                           fontsize=12, fontweight='bold')
-        
-        # Afficher le chemin parcouru
-        if show_path and len(self.history) > 1:
-            history_array = np.array(self.history)
-            self.ax.plot(history_array[:, 1], history_array[:, 0], 
-                        'ro-', linewidth=2, markersize=8, alpha=0.6, 
-                        label='Chemin de l\'agent')
-        
-        # Position actuelle de l'agent
-        current_y, current_x = self.current_state
-        self.ax.plot(current_x, current_y, 's', markersize=20, 
-                    color='red', label='Agent actuel')
-        
-        # Configuration du graphique
-        self.ax.set_xlim(-0.5, 3.5)
-        self.ax.set_ylim(-0.5, 3.5)
-        self.ax.set_xticks(range(4))
-        self.ax.set_yticks(range(4))
-        self.ax.grid(True)
-        self.ax.set_aspect('equal')
-        self.ax.set_title(f'Position: {self.current_state} | Historique: {len(self.history)} steps', 
-                         fontsize=14)
-        self.ax.legend()
-        
-        plt.draw()
-        plt.pause(delay)
\ No newline at end of file
+        """Affiche l'état courant ; seuls le chemin et l'agent sont redessinés.
+
+        Avec un renderer hors écran (init_visualization(offscreen=True)),
+        renvoie la frame RGB au lieu de l'afficher.
+        """
+        if self.renderer is None:
+            self.init_visualization()
+        frame = self.renderer.draw(show_path)
+        self.renderer.pause(delay)
+        return frame
+
+class BatchedGridEnv:
+    """K independent GridEnv copies stepped with one vectorized call.
+
+    States are flat cell indices i * cols + j and actions are indices into
+    GridEnv.action_space. A step is one gather in a precomputed [S, 4]
+    successor table. Finished envs are reset to (0, 0) in place by step();
+    the states to act on next are in get_state(). All copies draw their
+    random moves from one generator, so results for a given seed depend on
+    the number of copies.
+    """
+
+    def __init__(self, num_envs, deterministic=False, grid_size=(4, 4), terminal_state=None,
+                 rewards=None, seed=None):
+        if rewards is not None:
+            rewards = np.asarray(rewards, dtype=float)
+            grid_size = rewards.shape
+        self.num_envs = num_envs
+        self.grid_size = tuple(grid_size)
+        self.terminal_state = tuple(terminal_state) if terminal_state is not None else (self.grid_size[0] - 1, self.grid_size[1] - 1)
+        self.deterministic = deterministic
+        self.rewards = rewards if rewards is not None else default_rewards(self.grid_size, self.terminal_state)
+
+        # Same action order as GridEnv.action_space
+        self.action_space = ['up', 'down', 'left', 'right']
+        rows, cols = self.grid_size
+        i, j = np.divmod(np.arange(rows * cols), cols)
+        self.successors = np.stack([np.clip(i + di, 0, rows - 1) * cols + np.clip(j + dj, 0, cols - 1)
+                                    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]], axis=1)
+        self.n_states = rows * cols
+        self.terminal = self.terminal_state[0] * cols + self.terminal_state[1]
+        self.flat_rewards = self.rewards.ravel()
+
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self, mask=None):
+        """Reset all envs, or only those selected by a boolean mask"""
+        if mask is None:
+            self.states[:] = 0
+        else:
+            self.states[mask] = 0
+        return self.get_state()
+
+    def get_state(self):
+        return self.states.copy()
+
+    def step(self, actions):
+        """Returns (next_states, rewards, dones) for the transitions just taken"""
+        if not self.deterministic:
+            # GridEnv.step ignores the chosen action and samples a move uniformly
+            actions = self.rng.integers(4, size=self.num_envs)
+        next_states = self.successors[self.states, actions]
+        rewards = self.flat_rewards[next_states]
+        dones = next_states == self.terminal
+
+        self.states = next_states.copy()
+        if dones.any():
+            self.states[dones] = 0
+        return next_states, rewards, dones
@@ -0,0 +1,155 @@
+import os
+import numpy as np
+
+class GridRenderer:
+    """Rendu d'un GridEnv avec artistes en cache et blitting.
+
+    La grille (cases, rewards, légende) est dessinée une seule fois et gardée
+    comme fond ; chaque frame restaure ce fond et ne redessine que le chemin,
+    l'agent et le texte d'état.
+
+    offscreen=True dessine sur un canvas Agg, sans pyplot ni fenêtre. Chaque
+    frame peut alors être écrite en PNG dans frames_dir et / ou gardée en
+    mémoire (keep_frames=True, voir frames_array()).
+    """
+
+    def __init__(self, env, offscreen=False, frames_dir=None, keep_frames=False,
+                 figsize=(8, 8), dpi=100):
+        self.env = env
+        self.offscreen = offscreen
+        self.frames_dir = frames_dir
+        self.keep_frames = keep_frames
+        self.frames = []
+        self.frame_count = 0
+        if frames_dir is not None:
+            os.makedirs(frames_dir, exist_ok=True)
+
+        if offscreen:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.add_subplot()
+        else:
+            import matplotlib.pyplot as plt
+            self.fig, self.ax = plt.subplots(figsize=figsize, dpi=dpi)
+        self._draw_static()
+
+        # Artistes mis à jour à chaque frame, exclus du fond
+        self.path_line, = self.ax.plot([], [], 'ro-', linewidth=2, markersize=8, alpha=0.6,
+                                       label='Chemin de l\'agent', animated=True)
+        self.agent_marker, = self.ax.plot([], [], 's', markersize=20, color='red',
+                                          label='Agent actuel', animated=True)
+        self.status = self.ax.text(0.5, 1.01, '', transform=self.ax.transAxes, ha='center',
+                                   va='bottom', fontsize=14, animated=True)
+        self.ax.legend(handles=[self.path_line, self.agent_marker], loc='upper right')
+
+        self.background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        if not offscreen:
+            plt.show(block=False)
+        self.fig.canvas.draw()
+
+    def _draw_static(self):
+        import matplotlib.patches as patches
+        env = self.env
+        rows, cols = env.grid_size
+        for i in range(rows):
+            for j in range(cols):
+                if (i, j) == env.terminal_state:
+                    color = 'lightgreen'
+                elif env.rewards[i, j] < 0:
+                    color = 'lightcoral'
+                else:
+                    color = 'lightblue'
+
+                self.ax.add_patch(patches.Rectangle((j-0.5, i-0.5), 1, 1,
+                                                    linewidth=2, edgecolor='black',
+                                                    facecolor=color, alpha=0.7))
+                self.ax.text(j, i, f"{env.rewards[i, j]:.1f}", ha='center', va='center',
+                             fontsize=12, fontweight='bold')
+
+        self.ax.set_xlim(-0.5, cols - 0.5)
+        self.ax.set_ylim(-0.5, rows - 0.5)
+        self.ax.set_xticks(range(cols))
+        self.ax.set_yticks(range(rows))
+        self.ax.grid(True)
+        self.ax.set_aspect('equal')
+        self.fig.suptitle('Grid World - Reinforcement Learning', fontsize=16)
+
+    def _on_draw(self, event):
+        # Redessin complet (création, redimensionnement) : nouveau fond
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in (self.path_line, self.agent_marker, self.status):
+            self.fig.draw_artist(artist)
+
+    def draw(self, show_path=True):
+        """Dessine l'état courant de l'env ; renvoie la frame RGB en offscreen"""
+        env = self.env
+        history = env.history
+        if show_path and len(history) > 1:
+            path = np.asarray(history)
+            self.path_line.set_data(path[:, 1], path[:, 0])
+        else:
+            self.path_line.set_data([], [])
+        current_y, current_x = env.current_state
+        self.agent_marker.set_data([current_x], [current_y])
+        self.status.set_text(f'Position: {env.current_state} | Historique: {len(history)} steps')
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        self._draw_animated()
+        if not self.offscreen:
+            canvas.blit(self.fig.bbox)
+            canvas.flush_events()
+            return None
+
+        frame = np.asarray(canvas.buffer_rgba())[:, :, :3]
+        if self.frames_dir is not None:
+            from matplotlib.image import imsave
+            imsave(os.path.join(self.frames_dir, f"frame_{self.frame_count:05d}.png"), frame)
+        if self.keep_frames:
+            frame = frame.copy()
+            self.frames.append(frame)
+        self.frame_count += 1
+        return frame
+
+    def pause(self, delay):
+        """Attend sans redessiner la figure (plt.pause redessinerait tout)"""
+        if not self.offscreen and delay > 0:
+            self.fig.canvas.start_event_loop(delay)
+
+    def frames_array(self):
+        """Frames gardées en mémoire, tableau uint8 [T, H, W, 3]"""
+        return np.stack(self.frames)
+
+    def close(self):
+        if not self.offscreen:
+            import matplotlib.pyplot as plt
+            plt.close(self.fig)
+
+def record_episode(env, agent, max_steps=None, show_path=True, **renderer_kwargs):
+    """Joue un épisode de `agent` et l'enregistre hors écran.
+
+    Renvoie (frames [T, H, W, 3], reward total, steps) ; avec frames_dir les
+    frames sont aussi écrites en PNG.
+    """
+    renderer_kwargs.setdefault('keep_frames', True)
+    renderer = GridRenderer(env, offscreen=True, **renderer_kwargs)
+    state = env.reset()
+    renderer.draw(show_path)
+    total_reward = 0
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        action = agent.act(state)
+        state, reward, done, _ = env.step(action)
+        total_reward += reward
+        steps += 1
+        renderer.draw(show_path)
+        if done:
+            break
+    frames = renderer.frames_array() if renderer.frames else None
+    return frames, total_reward, steps
@@ -1,28 +1,28 @@
 import sys
 import os
 
-# Ajouter le chemin des agents
-sys.path.append(os.path.join(os.path.dirname(__file__), 'agents'))
+# Ajouter les dossiers du projet (package agents, grid_env, utils)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'grid_env'))
+sys.path.append(os.path.join(ROOT, 'utils'))
 
+import numpy as np
 from grid_env import GridEnv
-from agents import RandomAgent, ValueIterationAgent, PolicyIterationAgent, MonteCarloAgent, QLearningAgent
+from agents import get_agent
 from utils import train_agent, evaluate_agent, plot_results
+from lockstep import run_lockstep
+from compare import compare_agents_parallel
 
 def compare_agents(episodes=1000):
     """Compare les performances de tous les agents"""
-    agents = [
-        RandomAgent,
-        ValueIterationAgent, 
-        PolicyIterationAgent,
-        MonteCarloAgent,
-        QLearningAgent
-    ]
+    agents = ["random", "vi", "pi", "mc", "q"]
     
     results = {}
     
-    for AgentClass in agents:
+    for agent_name in agents:
         env = GridEnv(deterministic=False)
-        agent = AgentClass(env)
+        agent = get_agent(agent_name)(env)
         
         print(f"\n{'='*50}")
         print(f"TEST DE {agent.name}")
@@ -48,13 +48,37 @@ def compare_agents(episodes=1000):
     
     return results
 
+def compare_agents_lockstep(episodes=500, seeds=32, last=100):
+    """Compare Random, Monte Carlo et Q-Learning sur `seeds` graines entraînées en parallèle"""
+    results = {}
+    
+    for name, algorithm in [("Random", "random"), ("Monte Carlo", "monte_carlo"), ("Q-Learning", "q_learning")]:
+        run = run_lockstep(algorithm, num_seeds=seeds, episodes=episodes, deterministic=False)
+        # Performance finale de chaque graine : moyenne sur les `last` derniers épisodes
+        final_rewards = run['rewards'][:, -last:].mean(axis=1)
+        final_steps = run['steps'][:, -last:].mean(axis=1)
+        
+        results[name] = {
+            'mean_reward': np.mean(final_rewards),
+            'std_reward': np.std(final_rewards),
+            'mean_steps': np.mean(final_steps),
+            'std_steps': np.std(final_steps)
+        }
+        print(f"{name} ({seeds} graines):")
+        print(f"  Reward moyen: {results[name]['mean_reward']:.3f} ± {results[name]['std_reward']:.3f}")
+        print(f"  Steps moyen: {results[name]['mean_steps']:.1f} ± {results[name]['std_steps']:.1f}")
+    
+    return results
+
 def main():
     print("=== FRAMEWORK RL AVEC MULTIPLES AGENTS ===")
     print("1. Comparer tous les agents")
     print("2. Tester un agent spécifique")
     print("3. Visualiser un agent optimal")
+    print("4. Comparer les agents d'apprentissage sur plusieurs graines")
+    print("5. Comparer tous les agents en parallèle (graines x grilles, intervalles de confiance)")
     
-    choix = input("Choisissez le mode (1, 2 ou 3): ").strip()
+    choix = input("Choisissez le mode (1, 2, 3, 4 ou 5): ").strip()
     
     if choix == "1":
         results = compare_agents(episodes=500)
@@ -65,19 +89,11 @@ def main():
         
         env = GridEnv(deterministic=False)
         
-        agents_map = {
-            "random": RandomAgent,
-            "vi": ValueIterationAgent,
-            "pi": PolicyIterationAgent, 
-            "mc": MonteCarloAgent,
-            "q": QLearningAgent
-        }
-        
-        if agent_type in agents_map:
-            agent = agents_map[agent_type](env)
-        else:
+        try:
+            agent = get_agent(agent_type)(env)
+        except KeyError:
             print("Agent non reconnu, utilisation de Random")
-            agent = RandomAgent(env)
+            agent = get_agent("random")(env)
         
         rewards, steps = train_agent(env, agent, episodes=1000, learning=True)
         
@@ -87,7 +103,7 @@ def main():
         
     elif choix == "3":
         env = GridEnv(deterministic=True)
-        agent = ValueIterationAgent(env)
+        agent = get_agent("vi")(env)
         
         print("Visualisation de l'agent optimal...")
         state = env.reset()
@@ -111,12 +127,22 @@ def main():
                 
         env.render(delay=3)
         
+    elif choix == "4":
+        results = compare_agents_lockstep(episodes=500, seeds=32)
+        plot_results(results)
+        
+    elif choix == "5":
+        configs = [{'deterministic': False}, {'deterministic': False, 'grid_size': (6, 6)}]
+        results = compare_agents_parallel(seeds=range(10), env_configs=configs, episodes=500)
+        for name, r in results.items():
+            print(f"{name}: reward {r['mean_reward']:.3f} [{r['reward_ci'][0]:.3f}, {r['reward_ci'][1]:.3f}], "
+                  f"steps {r['mean_steps']:.1f} [{r['steps_ci'][0]:.1f}, {r['steps_ci'][1]:.1f}]")
+        plot_results(results)
+        
     else:
         print("Mode par défaut: comparaison rapide")
         results = compare_agents(episodes=100)
         plot_results(results)
 
 if __name__ == "__main__":
-    import numpy as np
-    import matplotlib.pyplot as plt
     main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Straightforward dict-based versions of the planners, used as test oracles"""
+import sys
+import os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (ROOT, os.path.join(ROOT, 'grid_env'), os.path.join(ROOT, 'utils')):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+import numpy as np
+
+GAMMA = 0.9
+# Envs the planners are checked on: the default 4x4 grid both ways, plus a
+# non-square grid with its goal off the corner
+ENV_CONFIGS = [
+    {'deterministic': True},
+    {'deterministic': False},
+    {'deterministic': True, 'grid_size': (3, 5), 'terminal_state': (0, 4)},
+    {'deterministic': False, 'grid_size': (3, 5), 'terminal_state': (0, 4)},
+]
+
+def next_state(env, state, move):
+    """Cell reached by `move` from `state`, staying inside the grid like GridEnv.step"""
+    return (max(0, min(env.grid_size[0] - 1, state[0] + move[0])),
+            max(0, min(env.grid_size[1] - 1, state[1] + move[1])))
+
+def expected_q(env, values, state, action, gamma=GAMMA):
+    """Q(state, action) under GridEnv.step: uniform random moves when not deterministic"""
+    if state == tuple(env.terminal_state):
+        return 0.0
+    moves = [env.actions[action]] if env.deterministic else list(env.actions.values())
+    total = 0.0
+    for move in moves:
+        s = next_state(env, state, move)
+        total += env.rewards[s] + gamma * values[s]
+    return total / len(moves)
+
+def reference_values(env, gamma=GAMMA, theta=1e-12):
+    """V* of a GridEnv by synchronous sweeps over every state and action"""
+    values = {state: 0.0 for state in env.get_all_states()}
+    while True:
+        new_values = {state: max(expected_q(env, values, state, action, gamma)
+                                 for action in env.action_space)
+                      for state in values}
+        delta = max(abs(new_values[s] - values[s]) for s in values)
+        values = new_values
+        if delta < theta:
+            break
+    grid = np.zeros(env.grid_size)
+    for state, value in values.items():
+        grid[state] = value
+    return grid
+
+class BaselineMonteCarloAgent:
+    """First-visit Monte Carlo as the agent was written before the vectorized update"""
+
+    def __init__(self, env, gamma=GAMMA):
+        self.env = env
+        self.gamma = gamma
+        self.Q = {}
+        self.returns = {}
+        self.visit_count = {}
+
+    def update(self, episode):
+        G = 0
+        for t in range(len(episode) - 1, -1, -1):
+            state, action, reward = episode[t]
+            G = self.gamma * G + reward
+            if (state, action) not in [(s, a) for s, a, _ in episode[:t]]:
+                a = self.env.action_space.index(action)
+                self.returns.setdefault((state, action), []).append(G)
+                self.Q.setdefault(state, np.zeros(len(self.env.action_space)))[a] = \
+                    np.mean(self.returns[(state, action)])
+                self.visit_count.setdefault(state, np.zeros(len(self.env.action_space)))[a] += 1
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from reference import GAMMA
+from grid_env import GridEnv
+from agents import MonteCarloAgent, QLearningAgent
+from lockstep import run_lockstep
+
+EPISODES = 60
+MAX_STEPS = 60
+EPSILON = 0.5
+
+def run_sequential(agent, env, seed):
+    """Train one agent episode by episode with run_lockstep's exploration draws.
+
+    run_lockstep draws one uniform u per step from default_rng(seed + 1):
+    u < epsilon explores with action floor(u / epsilon * A), otherwise the
+    first maximizing action is taken.
+    """
+    rng = np.random.default_rng(seed + 1)
+    A = len(env.action_space)
+    rewards, steps = [], []
+    for _ in range(EPISODES):
+        state = env.reset()
+        episode = []
+        total = 0.0
+        while True:
+            u = rng.random()
+            a = int(u / EPSILON * A) if u < EPSILON else int(agent.Q[state].argmax())
+            action = env.action_space[a]
+            next_state, reward, done, _ = env.step(action)
+            total += reward
+            episode.append((state, action, reward))
+            if not getattr(agent, 'episodic', False):
+                agent.update(state, action, reward, next_state, done)
+            state = next_state
+            if done or len(episode) >= MAX_STEPS:
+                break
+        if getattr(agent, 'episodic', False):
+            agent.update(episode)
+        rewards.append(total)
+        steps.append(len(episode))
+    return np.array(rewards), np.array(steps)
+
+def test_single_seed_matches_q_learning_agent():
+    env = GridEnv(deterministic=True)
+    agent = QLearningAgent(env, gamma=GAMMA, alpha=0.1, epsilon=EPSILON)
+    rewards, steps = run_sequential(agent, env, seed=7)
+
+    result = run_lockstep("q_learning", num_seeds=1, episodes=EPISODES, gamma=GAMMA, alpha=0.1,
+                          epsilon=EPSILON, max_steps=MAX_STEPS, seed=7, deterministic=True)
+    # Both goal and truncated episodes, so both kinds of update are compared
+    assert 0 < (steps < MAX_STEPS).sum() < EPISODES
+    np.testing.assert_array_equal(result['steps'][0], steps)
+    np.testing.assert_allclose(result['rewards'][0], rewards, atol=1e-9)
+    np.testing.assert_allclose(result['Q'][0], agent.Q.table, rtol=1e-5, atol=1e-6)
+
+def test_single_seed_matches_monte_carlo_agent():
+    env = GridEnv(deterministic=True)
+    agent = MonteCarloAgent(env, gamma=GAMMA, epsilon=EPSILON)
+    rewards, steps = run_sequential(agent, env, seed=3)
+
+    result = run_lockstep("monte_carlo", num_seeds=1, episodes=EPISODES, gamma=GAMMA,
+                          epsilon=EPSILON, max_steps=MAX_STEPS, seed=3, deterministic=True)
+    np.testing.assert_array_equal(result['steps'][0], steps)
+    np.testing.assert_allclose(result['rewards'][0], rewards, atol=1e-9)
+    np.testing.assert_allclose(result['Q'][0], agent.Q.table, rtol=1e-5, atol=1e-6)
+
+@pytest.mark.parametrize("algorithm", ["random", "q_learning", "monte_carlo"])
+def test_every_seed_records_all_episodes(algorithm):
+    result = run_lockstep(algorithm, num_seeds=5, episodes=20, max_steps=MAX_STEPS, seed=0)
+    assert result['rewards'].shape == (5, 20)
+    assert result['Q'].shape == (5, 16, 4)
+    assert (result['steps'] >= 1).all() and (result['steps'] <= MAX_STEPS).all()
@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from reference import ENV_CONFIGS, GAMMA, expected_q
+from grid_env import GridEnv
+from agents import ValueIterationAgent
+from mdp import compile_model
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_q_values_match_env_dynamics(config):
+    env = GridEnv(**config)
+    model = compile_model(env)
+    values = np.random.default_rng(0).normal(size=env.grid_size)
+    q = model.q_values(values, GAMMA)
+    for state in env.get_all_states():
+        s = model.index(state)
+        for a, action in enumerate(model.actions):
+            assert q[a, s] == pytest.approx(expected_q(env, values, state, action), abs=1e-12)
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_transition_rows(config):
+    """Live rows are distributions, terminal rows are empty (absorbing with value 0)"""
+    env = GridEnv(**config)
+    model = compile_model(env)
+    sums = np.asarray(model.P.sum(axis=1)).reshape(model.n_actions, model.n_states)
+    np.testing.assert_allclose(sums[:, ~model.terminal], 1.0)
+    assert not sums[:, model.terminal].any()
+    assert not model.R[:, model.terminal].any()
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_predecessors(config):
+    env = GridEnv(**config)
+    model = compile_model(env)
+    indptr, states, probs = model.predecessors()
+    P = model.P.toarray().reshape(model.n_actions, model.n_states, model.n_states)
+    best = P.max(axis=0)
+    for target in range(model.n_states):
+        found = dict(zip(states[indptr[target]:indptr[target + 1]],
+                         probs[indptr[target]:indptr[target + 1]]))
+        expected = {s: best[s, target] for s in np.flatnonzero(best[:, target])}
+        assert found.keys() == expected.keys()
+        for s, p in expected.items():
+            assert found[s] == pytest.approx(p)
+
+def test_model_is_cached_until_env_changes():
+    env = GridEnv(deterministic=False)
+    model = compile_model(env)
+    assert compile_model(env) is model
+    assert ValueIterationAgent(env, theta=1e-3).model is model
+
+    env.rewards = env.rewards.copy()
+    env.rewards[0, 1] = -1.0
+    changed = compile_model(env)
+    assert changed is not model
+    assert changed.R.min() < model.R.min()
+
+    env.deterministic = True
+    assert compile_model(env) is not changed
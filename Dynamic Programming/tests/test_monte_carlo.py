@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import random
+import numpy as np
+import pytest
+from reference import GAMMA, BaselineMonteCarloAgent
+from grid_env import GridEnv
+from agents import MonteCarloAgent
+from MC_agent import discounted_returns, mc_update
+
+def naive_returns(rewards, gamma):
+    G = 0.0
+    returns = []
+    for r in reversed(rewards):
+        G = gamma * G + r
+        returns.append(G)
+    return returns[::-1]
+
+@pytest.mark.parametrize("gamma", [0.0, 0.5, 0.9, 0.99, 1.0])
+@pytest.mark.parametrize("length", [1, 7, 1000])
+def test_discounted_returns_match_reverse_loop(gamma, length):
+    rewards = np.random.default_rng(length).normal(size=length)
+    np.testing.assert_allclose(discounted_returns(rewards, gamma), naive_returns(rewards, gamma),
+                               rtol=1e-9, atol=1e-9)
+
+@pytest.mark.parametrize("block", [1, 4, 100])
+def test_discounted_returns_chain_blocks(block):
+    rewards = np.random.default_rng(0).normal(size=250)
+    np.testing.assert_allclose(discounted_returns(rewards, 0.95, block=block),
+                               naive_returns(rewards, 0.95), rtol=1e-9, atol=1e-9)
+
+def test_discounted_returns_long_episode_stay_finite():
+    """gamma^t underflows long before 10^5 steps, the blocks never form it"""
+    rewards = np.ones(100000)
+    G = discounted_returns(rewards, 0.5)
+    assert np.isfinite(G).all()
+    np.testing.assert_allclose(G[:-50], 2.0)
+
+def random_episodes(env, count, seed):
+    """Random-walk episodes of (state, action, reward), with repeated pairs"""
+    rng = random.Random(seed)
+    episodes = []
+    for _ in range(count):
+        state = env.reset()
+        episode = []
+        for _ in range(60):
+            action = rng.choice(env.action_space)
+            next_state, reward, done, _ = env.step(action)
+            episode.append((state, action, reward))
+            state = next_state
+            if done:
+                break
+        episodes.append(episode)
+    return episodes
+
+@pytest.mark.parametrize("deterministic", [True, False])
+def test_first_visit_matches_baseline_agent(deterministic):
+    random.seed(0)
+    env = GridEnv(deterministic=deterministic)
+    agent = MonteCarloAgent(env, gamma=GAMMA)
+    baseline = BaselineMonteCarloAgent(env, gamma=GAMMA)
+    for episode in random_episodes(env, 40, seed=1):
+        agent.update(episode)
+        baseline.update(episode)
+
+    for state in env.get_all_states():
+        counts = baseline.visit_count.get(state, np.zeros(4))
+        np.testing.assert_array_equal(agent.visit_count[agent.Q.row(state)], counts)
+        q = baseline.Q.get(state, np.zeros(4))
+        np.testing.assert_allclose(agent.Q[state], q, rtol=1e-5, atol=1e-6)
+
+def naive_update(q, counts, keys, returns, visit, alpha):
+    seen = set()
+    for key, G in zip(keys, returns):
+        if visit == "first" and key in seen:
+            continue
+        seen.add(key)
+        counts[key] += 1
+        step_size = alpha if alpha is not None else 1.0 / counts[key]
+        q[key] += step_size * (G - q[key])
+
+@pytest.mark.parametrize("visit, alpha", [("first", None), ("first", 0.1),
+                                          ("every", None), ("every", 0.1)])
+def test_mc_update_matches_sequential_updates(visit, alpha):
+    rng = np.random.default_rng(0)
+    q, counts = np.zeros(12), np.zeros(12, dtype=np.int64)
+    expected_q, expected_counts = q.copy(), counts.copy()
+    for _ in range(20):
+        keys = rng.integers(12, size=rng.integers(1, 30))
+        returns = rng.normal(size=len(keys))
+        mc_update(q, counts, keys, returns, visit, alpha)
+        naive_update(expected_q, expected_counts, keys, returns, visit, alpha)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(q, expected_q, atol=1e-12)
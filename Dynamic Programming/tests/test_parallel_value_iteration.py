@@ -0,0 +1,25 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from reference import ENV_CONFIGS, GAMMA, reference_values
+from grid_env import GridEnv
+from agents import ParallelValueIterationAgent, ValueIterationAgent
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_values_match_reference(config):
+    env = GridEnv(**config)
+    agent = ParallelValueIterationAgent(env, gamma=GAMMA, theta=1e-10, workers=2)
+    np.testing.assert_allclose(agent.values, reference_values(env), atol=1e-6)
+
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("deterministic", [True, False])
+def test_same_as_sync_sweeps(deterministic, workers):
+    """Stripes give the values and policy of the single-process sweeps"""
+    env = GridEnv(deterministic=deterministic, grid_size=(7, 5), terminal_state=(3, 2))
+    parallel = ParallelValueIterationAgent(env, gamma=GAMMA, theta=1e-8, workers=workers)
+    sync = ValueIterationAgent(env, gamma=GAMMA, theta=1e-8)
+    np.testing.assert_allclose(parallel.values, sync.values, atol=1e-12)
+    np.testing.assert_array_equal(parallel.policy_indices, sync.policy_indices)
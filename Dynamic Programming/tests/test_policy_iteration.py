@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from reference import ENV_CONFIGS, GAMMA, reference_values
+from grid_env import GridEnv
+from agents import PolicyIterationAgent, ValueIterationAgent
+
+@pytest.mark.parametrize("evaluation", PolicyIterationAgent.EVALUATIONS)
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_values_match_reference(config, evaluation):
+    np.random.seed(0)
+    env = GridEnv(**config)
+    agent = PolicyIterationAgent(env, gamma=GAMMA, evaluation=evaluation, theta=1e-10)
+    np.testing.assert_allclose(agent.values, reference_values(env), atol=1e-6)
+
+@pytest.mark.parametrize("evaluation", PolicyIterationAgent.EVALUATIONS)
+def test_policy_matches_value_iteration(evaluation):
+    np.random.seed(1)
+    env = GridEnv(deterministic=True)
+    pi = PolicyIterationAgent(env, gamma=GAMMA, evaluation=evaluation, theta=1e-10)
+    vi = ValueIterationAgent(env, gamma=GAMMA, theta=1e-10)
+    # Same values under both greedy policies, ties may pick different actions
+    q = vi.model.q_values(vi.values, GAMMA)
+    states = np.flatnonzero(~vi.model.terminal)
+    chosen = q[pi.policy_indices.ravel()[states], states]
+    np.testing.assert_allclose(chosen, q.max(axis=0)[states], atol=1e-6)
+
+def test_exact_evaluation_solves_bellman_equation():
+    """One exact evaluation gives v = r_pi + gamma * P_pi v for the evaluated policy"""
+    np.random.seed(2)
+    env = GridEnv(deterministic=False, grid_size=(6, 6))
+    agent = PolicyIterationAgent(env, gamma=GAMMA, evaluation="exact")
+    P, rewards = agent.model.policy_matrix(agent.policy_indices)
+    v = agent.values.ravel()
+    np.testing.assert_allclose(v, rewards + GAMMA * (P @ v), atol=1e-10)
+
+@pytest.mark.parametrize("sweeps", [1, 3])
+def test_modified_few_sweeps_still_converges(sweeps):
+    np.random.seed(3)
+    env = GridEnv(deterministic=False)
+    agent = PolicyIterationAgent(env, gamma=GAMMA, evaluation="modified", sweeps=sweeps,
+                                 theta=1e-10)
+    np.testing.assert_allclose(agent.values, reference_values(env), atol=1e-6)
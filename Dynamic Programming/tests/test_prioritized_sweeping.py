@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from reference import ENV_CONFIGS, GAMMA, reference_values
+from grid_env import GridEnv
+from agents import ValueIterationAgent
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_values_match_reference(config):
+    env = GridEnv(**config)
+    agent = ValueIterationAgent(env, gamma=GAMMA, theta=1e-10, mode="prioritized")
+    np.testing.assert_allclose(agent.values, reference_values(env), atol=1e-6)
+
+@pytest.mark.parametrize("deterministic", [True, False])
+def test_residual_below_theta(deterministic):
+    env = GridEnv(deterministic=deterministic, grid_size=(12, 12))
+    theta = 1e-6
+    agent = ValueIterationAgent(env, gamma=GAMMA, theta=theta, mode="prioritized")
+    v = agent.values.ravel()
+    assert np.abs(agent.model.backup(v, GAMMA) - v).max() <= theta
+
+def test_sparse_rewards_need_fewer_backups():
+    """Only the goal pays: the backups spread back from it instead of sweeping everything"""
+    rewards = np.zeros((30, 30))
+    rewards[-1, -1] = 1.0
+    env = GridEnv(deterministic=True, rewards=rewards)
+    sync = ValueIterationAgent(env, gamma=GAMMA, theta=1e-6)
+    prioritized = ValueIterationAgent(env, gamma=GAMMA, theta=1e-6, mode="prioritized")
+    assert prioritized.backups < sync.backups
+    np.testing.assert_allclose(prioritized.values, sync.values, atol=2e-5)
+
+def test_max_backups_budget():
+    env = GridEnv(deterministic=False, grid_size=(10, 10))
+    agent = ValueIterationAgent(env, gamma=GAMMA, mode="prioritized", max_backups=50)
+    assert agent.backups <= 50
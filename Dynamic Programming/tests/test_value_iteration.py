@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from reference import ENV_CONFIGS, GAMMA, expected_q, reference_values
+from grid_env import GridEnv
+from agents import ValueIterationAgent
+from mdp import TabularMDP, GridShiftMDP, compile_model
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_sync_values_match_reference(config):
+    env = GridEnv(**config)
+    agent = ValueIterationAgent(env, gamma=GAMMA, theta=1e-10)
+    np.testing.assert_allclose(agent.values, reference_values(env), atol=1e-6)
+
+@pytest.mark.parametrize("config", ENV_CONFIGS)
+def test_greedy_policy_is_optimal(config):
+    env = GridEnv(**config)
+    agent = ValueIterationAgent(env, gamma=GAMMA, theta=1e-10)
+    values = reference_values(env)
+    for state in env.get_all_states():
+        action = agent.act(state)
+        if state == tuple(env.terminal_state):
+            assert action is None
+            continue
+        best = max(expected_q(env, values, state, a) for a in env.action_space)
+        assert expected_q(env, values, state, action) == pytest.approx(best, abs=1e-6)
+
+def test_stencil_backup_matches_transition_matrix():
+    """The shifted-grid kernels of a deterministic grid agree with P @ V"""
+    env = GridEnv(deterministic=True, grid_size=(5, 7), terminal_state=(2, 3))
+    model = compile_model(env)
+    assert isinstance(model, GridShiftMDP)
+    values = np.random.default_rng(0).normal(size=model.n_states)
+    np.testing.assert_allclose(model.q_values(values, GAMMA),
+                               TabularMDP.q_values(model, values, GAMMA), atol=1e-12)
+    np.testing.assert_allclose(model.backup(values, GAMMA),
+                               TabularMDP.backup(model, values, GAMMA), atol=1e-12)
+    np.testing.assert_array_equal(model.greedy(values, GAMMA),
+                                  TabularMDP.greedy(model, values, GAMMA))
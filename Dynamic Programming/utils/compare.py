@@ -0,0 +1,152 @@
+import sys
+import os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (ROOT, os.path.join(ROOT, 'grid_env'), os.path.join(ROOT, 'utils')):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+import contextlib
+import io
+import random
+import time
+import multiprocessing as mp
+import numpy as np
+
+PLANNERS = ("vi", "pvi", "pi")
+# Agents that start their own processes: pool workers are daemonic and
+# cannot have children, so these jobs run in the parent after the pool
+IN_PARENT = ("pvi",)
+
+def bootstrap_ci(values, confidence=0.95, n_boot=2000, seed=0):
+    """Percentile bootstrap interval of the mean of `values`"""
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:
+        return float(values.mean()), float(values.mean())
+    rng = np.random.default_rng(seed)
+    means = values[rng.integers(len(values), size=(n_boot, len(values)))].mean(axis=1)
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(means, [tail, 1 - tail])
+    return float(low), float(high)
+
+def job_seed(seed, agent, config_index):
+    """Seed of one (agent, seed, env-config) job, independent of scheduling order"""
+    key = [seed, config_index] + [ord(c) for c in agent]
+    return int(np.random.SeedSequence(key).generate_state(1)[0])
+
+def config_label(env_config):
+    rows, cols = env_config.get('grid_size', (4, 4))
+    kind = "déterministe" if env_config.get('deterministic', False) else "stochastique"
+    return f"{rows}x{cols} {kind}"
+
+def _cost(job):
+    """Rough relative cost, used to start the longest jobs first"""
+    agent, _, _, env_config, episodes, eval_episodes = job
+    rows, cols = env_config.get('grid_size', (4, 4))
+    return rows * cols * (eval_episodes if agent in PLANNERS else episodes)
+
+def _run(job):
+    """Train or plan one agent on one env config with one seed and summarize it"""
+    from grid_env import GridEnv
+    from agents import get_agent
+    from utils import train_agent, evaluate_agent
+
+    agent_name, seed, config_index, env_config, episodes, eval_episodes = job
+    s = job_seed(seed, agent_name, config_index)
+    random.seed(s)
+    np.random.seed(s % 2**32)
+
+    start = time.time()
+    env = GridEnv(**env_config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = get_agent(agent_name)(env)
+        if agent_name in PLANNERS:
+            # Agents de planification - évaluation seulement
+            rewards, steps = evaluate_agent(env, agent, episodes=eval_episodes)
+        else:
+            rewards, steps = train_agent(env, agent, episodes=episodes, learning=True)
+
+    return {
+        'agent': agent_name,
+        'name': agent.name,
+        'seed': seed,
+        'config_index': config_index,
+        'config': env_config,
+        'mean_reward': float(np.mean(rewards)),
+        'mean_steps': float(np.mean(steps)),
+        'seconds': time.time() - start
+    }
+
+def compare_agents_parallel(agents=("random", "vi", "pi", "mc", "q"), seeds=range(10),
+                            env_configs=({'deterministic': False},), episodes=500,
+                            eval_episodes=100, num_workers=None, confidence=0.95, on_result=None):
+    """Compare agents over (agent, seed, env-config) jobs run on a process pool.
+
+    Jobs are seeded from (seed, agent, config) only, so results do not depend
+    on the number of workers, and start longest first. Each finished job is
+    printed (and passed to on_result) as it arrives. Agents in IN_PARENT run
+    in this process once the pool is done.
+
+    Returns the results dict of plot_results, keyed by registry id (e.g.
+    "vi", "pvi", with the env config appended when several are given), with
+    the agent's display name and the mean, std and bootstrap confidence
+    interval over seeds.
+    """
+    env_configs = [dict(config) for config in env_configs]
+    jobs = [(agent, seed, c, config, episodes, eval_episodes)
+            for agent in agents for seed in seeds for c, config in enumerate(env_configs)]
+    jobs.sort(key=_cost, reverse=True)
+    pool_jobs = [job for job in jobs if job[0] not in IN_PARENT]
+    parent_jobs = [job for job in jobs if job[0] in IN_PARENT]
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    def label(agent, config_index):
+        if len(env_configs) > 1:
+            return f"{agent} ({config_label(env_configs[config_index])})"
+        return agent
+
+    runs = {}
+    done = 0
+
+    def collect(record):
+        nonlocal done
+        done += 1
+        runs.setdefault((record['agent'], record['config_index']), []).append(record)
+        print(f" [{done}/{len(jobs)}] {label(record['agent'], record['config_index'])} "
+              f"graine {record['seed']}: reward {record['mean_reward']:.3f}, "
+              f"steps {record['mean_steps']:.1f} ({record['seconds']:.1f}s)")
+        if on_result is not None:
+            on_result(record)
+
+    print(f" Comparaison: {len(agents)} agents x {len(seeds)} graines x {len(env_configs)} configs "
+          f"sur {num_workers} processus")
+    if pool_jobs:
+        ctx = mp.get_context('spawn')
+        with ctx.Pool(num_workers) as pool:
+            for record in pool.imap_unordered(_run, pool_jobs):
+                collect(record)
+    if parent_jobs:
+        # _run reseeds the global generators, give the caller its own back
+        rng_state = random.getstate(), np.random.get_state()
+        for job in parent_jobs:
+            collect(_run(job))
+        random.setstate(rng_state[0])
+        np.random.set_state(rng_state[1])
+
+    # Same order as the arguments, whatever order the jobs finished in
+    results = {}
+    for key in sorted(runs, key=lambda k: (list(agents).index(k[0]), k[1])):
+        records = sorted(runs[key], key=lambda r: r['seed'])
+        rewards = [r['mean_reward'] for r in records]
+        steps = [r['mean_steps'] for r in records]
+        results[label(*key)] = {
+            'name': records[0]['name'],
+            'mean_reward': float(np.mean(rewards)),
+            'std_reward': float(np.std(rewards)),
+            'reward_ci': bootstrap_ci(rewards, confidence),
+            'mean_steps': float(np.mean(steps)),
+            'std_steps': float(np.std(steps)),
+            'steps_ci': bootstrap_ci(steps, confidence),
+            'seeds': len(records)
+        }
+    return results
@@ -0,0 +1,111 @@
+import numpy as np
+from grid_env import BatchedGridEnv
+from MC_agent import discounted_returns, mc_update
+
+ALGORITHMS = ("random", "q_learning", "monte_carlo")
+
+def run_lockstep(algorithm, num_seeds=32, episodes=500, gamma=0.9, alpha=0.1, epsilon=0.1,
+                 max_steps=None, seed=None, **env_kwargs):
+    """Train `num_seeds` independent tabular agents in lockstep on a BatchedGridEnv.
+
+    Every step selects the K actions, steps the K envs and applies the K
+    updates as single array operations on a [K, S, A] Q-table. Q-learning
+    and random agents match QLearningAgent / RandomAgent; Monte Carlo uses
+    the same first-visit sample-mean update as MonteCarloAgent, applied to
+    a seed when its episode ends. Seeds that have finished their episodes
+    keep stepping but are no longer updated or recorded.
+
+    Returns a dict with per-seed 'rewards' and 'steps' histories of shape
+    [K, episodes] and the final 'Q' array.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm must be one of {ALGORITHMS}, got {algorithm!r}")
+    K = num_seeds
+    env = BatchedGridEnv(K, seed=seed, **env_kwargs)
+    S, A = env.n_states, len(env.action_space)
+    rng = np.random.default_rng(None if seed is None else seed + 1)
+
+    # Q[k, s, a] is read and written through flat row / element indices
+    Q = np.zeros((K, S, A), dtype=np.float32)
+    q_rows = Q.reshape(K * S, A)
+    q_flat = Q.reshape(-1)
+    base = np.arange(K) * S
+
+    rewards_history = np.zeros((K, episodes))
+    steps_history = np.zeros((K, episodes), dtype=np.int64)
+    finished = np.zeros(K, dtype=np.int64)
+    episode_reward = np.zeros(K)
+    episode_steps = np.zeros(K, dtype=np.int64)
+
+    if algorithm == "monte_carlo":
+        counts = np.zeros((K, S, A), dtype=np.int64)
+        capacity = 256
+        trajectory_keys = np.zeros((K, capacity), dtype=np.int64)
+        trajectory_rewards = np.zeros((K, capacity))
+        columns = np.arange(K)
+
+    active = np.ones(K, dtype=bool)
+    all_active = True
+    states = env.get_state()
+    while True:
+        # Epsilon-greedy from one uniform draw: u < epsilon explores with
+        # action floor(u / epsilon * A), otherwise the first maximizing action
+        u = rng.random(K)
+        if algorithm == "random":
+            actions = (u * A).astype(np.int64)
+        else:
+            rows = base + states
+            actions = q_rows[rows].argmax(axis=1)
+            explore = u < epsilon
+            actions[explore] = (u[explore] / epsilon * A).astype(np.int64)
+
+        next_states, rewards, dones = env.step(actions)
+        episode_reward += rewards
+        episode_steps += 1
+        ends = dones
+        if max_steps is not None:
+            truncated = (episode_steps >= max_steps) & ~dones
+            if truncated.any():
+                env.reset(truncated)
+                ends = dones | truncated
+
+        if algorithm == "q_learning":
+            cells = rows * A + actions
+            bootstrap = q_rows[base + next_states].max(axis=1)
+            bootstrap[dones] = 0.0
+            target = rewards + gamma * bootstrap
+            if all_active:
+                q_flat[cells] += alpha * (target - q_flat[cells])
+            else:
+                cells, target = cells[active], target[active]
+                q_flat[cells] += alpha * (target - q_flat[cells])
+        elif algorithm == "monte_carlo":
+            t = episode_steps - 1
+            if t.max() >= capacity:
+                capacity *= 2
+                trajectory_keys = np.pad(trajectory_keys, ((0, 0), (0, capacity - trajectory_keys.shape[1])))
+                trajectory_rewards = np.pad(trajectory_rewards, ((0, 0), (0, capacity - trajectory_rewards.shape[1])))
+            trajectory_keys[columns, t] = states * A + actions
+            trajectory_rewards[columns, t] = rewards
+
+        if ends.any():
+            done_seeds = np.flatnonzero(ends & active)
+            if algorithm == "monte_carlo":
+                for k in done_seeds:
+                    n = episode_steps[k]
+                    returns = discounted_returns(trajectory_rewards[k, :n], gamma)
+                    mc_update(Q[k].reshape(-1), counts[k].reshape(-1), trajectory_keys[k, :n], returns)
+
+            rewards_history[done_seeds, finished[done_seeds]] = episode_reward[done_seeds]
+            steps_history[done_seeds, finished[done_seeds]] = episode_steps[done_seeds]
+            finished[done_seeds] += 1
+            episode_reward[ends] = 0.0
+            episode_steps[ends] = 0
+
+            active = finished < episodes
+            if not active.any():
+                break
+            all_active = active.all()
+        states = env.get_state()
+
+    return {'rewards': rewards_history, 'steps': steps_history, 'Q': Q}
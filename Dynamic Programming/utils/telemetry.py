@@ -0,0 +1,6 @@
+"""Re-export of common/telemetry.py, shared with DQN"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from common.telemetry import NullTelemetry, Telemetry, peak_rss_mb
@@ -1,11 +1,26 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from telemetry import NullTelemetry
+from metrics import RollingStats
 
-def train_agent(env, agent, episodes=1000, learning=True):
+def train_agent(env, agent, episodes=1000, learning=True, telemetry=None, recorder=None,
+                keep_history=True):
+    """Entraîne l'agent et renvoie les historiques (rewards, steps) par épisode.
+
+    Avec un metrics.MetricsRecorder, chaque épisode est écrit sur disque ;
+    keep_history=False évite alors de garder les historiques en mémoire.
+    """
     print(f"=== ENTRAÎNEMENT {agent.name} ===")
     
+    # Per-phase timings, see telemetry.Telemetry
+    tel = telemetry if telemetry is not None else NullTelemetry()
+    
+    # Agents whose update() takes a whole episode (MonteCarloAgent.episodic)
+    episodic = getattr(agent, 'episodic', False)
+    
     rewards_history = []
     steps_history = []
+    reward_stats = RollingStats(window=100)
+    steps_stats = RollingStats(window=100)
     
     for episode in range(episodes):
         state = env.reset()
@@ -14,36 +29,49 @@ def train_agent(env, agent, episodes=1000, learning=True):
         episode_data = []
         
         while True:
-            action = agent.act(state)
-            next_state, reward, done, _ = env.step(action)
+            with tel.phase('action_selection'):
+                action = agent.act(state)
+            with tel.phase('env_step'):
+                next_state, reward, done, _ = env.step(action)
+            tel.count('env_steps')
             total_reward += reward
             steps += 1
             
             if learning:
-                if hasattr(agent, 'update') and not hasattr(agent.update, '__code__'):
-                    # Pour Monte Carlo
-                    episode_data.append((state, action, reward))
-                else:
-                    # Pour les autres agents
-                    agent.update(state, action, reward, next_state, done)
+                with tel.phase('update'):
+                    if episodic:
+                        # Monte Carlo : mise à jour en fin d'épisode
+                        episode_data.append((state, action, reward))
+                    else:
+                        # Pour les autres agents
+                        agent.update(state, action, reward, next_state, done)
+                tel.count('updates')
             
             state = next_state
             
             if done:
-                if learning and hasattr(agent, 'update') and hasattr(agent.update, '__code__'):
-                    if agent.update.__code__.co_argcount > 2:  # Pour Monte Carlo
+                if learning and episodic:
+                    with tel.phase('update'):
                         agent.update(episode_data)
                 
-                rewards_history.append(total_reward)
-                steps_history.append(steps)
+                if keep_history:
+                    rewards_history.append(total_reward)
+                    steps_history.append(steps)
+                reward_stats.update(total_reward)
+                steps_stats.update(steps)
+                tel.end_episode(episode, total_reward)
+                if recorder is not None:
+                    recorder.record(episode, reward=total_reward, steps=steps)
                 
                 if (episode + 1) % 100 == 0:
-                    avg_reward = np.mean(rewards_history[-100:])
-                    avg_steps = np.mean(steps_history[-100:])
+                    avg_reward = reward_stats.window_mean
+                    avg_steps = steps_stats.window_mean
                     print(f"Épisode {episode+1}: Reward moyen = {avg_reward:.2f}, "
                           f"Steps moyen = {avg_steps:.1f}")
                 break
     
+    if recorder is not None:
+        recorder.flush()
     return rewards_history, steps_history
 
 def evaluate_agent(env, agent, episodes=100):
@@ -69,20 +97,30 @@ def evaluate_agent(env, agent, episodes=100):
     
     return rewards_history, steps_history
 
+def _error_bars(results, names, key):
+    """Intervalle de confiance '<key>_ci' s'il existe (compare.py), sinon l'écart-type"""
+    if all(f'{key}_ci' in results[name] for name in names):
+        means = [results[name][f'mean_{key}'] for name in names]
+        low = [m - results[name][f'{key}_ci'][0] for m, name in zip(means, names)]
+        high = [results[name][f'{key}_ci'][1] - m for m, name in zip(means, names)]
+        return [low, high]
+    return [results[name][f'std_{key}'] for name in names]
+
 def plot_results(results):
+    import matplotlib.pyplot as plt
     names = list(results.keys())
     rewards = [results[name]['mean_reward'] for name in names]
     steps = [results[name]['mean_steps'] for name in names]
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
     
-    bars1 = ax1.bar(names, rewards, yerr=[results[name]['std_reward'] for name in names], 
+    bars1 = ax1.bar(names, rewards, yerr=_error_bars(results, names, 'reward'), 
                    capsize=5, alpha=0.7, color=['red', 'blue', 'green', 'orange', 'purple'])
     ax1.set_ylabel('Reward Moyen')
     ax1.set_title('Comparaison des Rewards par Agent')
     ax1.tick_params(axis='x', rotation=45)
     
-    bars2 = ax2.bar(names, steps, yerr=[results[name]['std_steps'] for name in names], 
+    bars2 = ax2.bar(names, steps, yerr=_error_bars(results, names, 'steps'), 
                    capsize=5, alpha=0.7, color=['red', 'blue', 'green', 'orange', 'purple'])
     ax2.set_ylabel('Steps Moyens')
     ax2.set_title('Comparaison des Steps par Agent')
@@ -0,0 +1,423 @@
+"""Microbenchmarks for the environments, agents and planners of the three projects.
+
+    python benchmarks/run_benchmarks.py                                # run, compare to baseline
+    python benchmarks/run_benchmarks.py --update-baseline --repeats 9  # record a new baseline
+    python benchmarks/run_benchmarks.py -k dqn                         # only names containing "dqn"
+
+Results are written as JSON ({name: {"ops_per_s": ..., "ratio": ...}}),
+where ratio is the benchmark's rate over that of a fixed calibration loop
+(medians over --repeats runs). Ratios, not raw ops/s, are compared against
+benchmarks/baseline.json, so a baseline recorded on one machine still holds
+on a faster or slower one; any benchmark whose ratio fell by more than
+--tolerance is reported and the exit code is 1. So is a benchmark that
+raises, a baseline entry with no result, or a missing baseline.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "DQN"))
+sys.path.append(os.path.join(ROOT, "Dynamic Programming", "grid_env"))
+sys.path.append(os.path.join(ROOT, "Dynamic Programming", "agents"))
+sys.path.append(os.path.join(ROOT, "Gridworld-Gymnasium"))
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a setup function returning the zero-argument callable to time"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def calibration_kernel():
+    """Fixed interpreter plus NumPy workload timed next to every benchmark"""
+    total = 0
+    for i in range(500):
+        total += i * i
+    values = np.arange(2000.0)
+    return total + float(np.sqrt(values * values + 1.0).sum())
+
+def _loop_size(fn, min_time):
+    """Number of calls per timing loop, so one loop takes >= min_time / 10"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time / 10:
+            return number
+        number *= 10
+
+def _rate(fn, number, min_time):
+    start = time.perf_counter()
+    calls = 0
+    while time.perf_counter() - start < min_time:
+        for _ in range(number):
+            fn()
+        calls += number
+    return calls / (time.perf_counter() - start)
+
+def measure(fn, min_time=0.2, repeats=5):
+    """Median calls per second of fn over `repeats` timing runs, and the median
+    ratio of that rate to calibration_kernel's, timed just before each run.
+
+    The ratio cancels most of the host's speed and of its drift during a
+    run (frequency scaling, other load), so it is what baselines compare.
+    """
+    number = _loop_size(fn, min_time)
+    calibration_number = _loop_size(calibration_kernel, min_time / 2)
+    rates, ratios = [], []
+    for _ in range(repeats):
+        calibration = _rate(calibration_kernel, calibration_number, min_time / 2)
+        rate = _rate(fn, number, min_time)
+        rates.append(rate)
+        ratios.append(rate / calibration)
+    return float(np.median(rates)), float(np.median(ratios))
+
+def dp_util(name):
+    """Import a Dynamic Programming/utils module.
+
+    That directory holds a utils.py module, which would shadow the DQN utils
+    package if it stayed on sys.path, so it is only added for this import.
+    """
+    path = os.path.join(ROOT, "Dynamic Programming", "utils")
+    sys.path.insert(0, path)
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(path)
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+# --- Environments -----------------------------------------------------------
+
+@benchmark("dqn_gridworld_step")
+def _dqn_gridworld_step():
+    from environments.gridword import GridWorld
+    env = GridWorld()
+
+    def run():
+        _, _, done = env.step(random.randrange(4))
+        if done:
+            env.reset()
+    return run
+
+def _grid_env_step(deterministic):
+    from grid_env import GridEnv
+    env = quiet(GridEnv, deterministic=deterministic)
+    env.reset()
+    actions = env.action_space
+
+    def run():
+        _, _, done, _ = env.step(random.choice(actions))
+        if done:
+            env.reset()
+    return run
+
+@benchmark("dp_gridenv_construct")
+def _dp_gridenv_construct():
+    from grid_env import GridEnv
+    return lambda: GridEnv(deterministic=False)
+
+@benchmark("dp_gridenv_render_offscreen")
+def _dp_gridenv_render_offscreen():
+    from grid_env import GridEnv
+    env = GridEnv(deterministic=False)
+    env.reset()
+    env.init_visualization(offscreen=True)
+
+    def run():
+        _, _, done, _ = env.step(random.choice(env.action_space))
+        if done:
+            env.reset()
+        env.render()
+    return run
+
+@benchmark("dp_gridenv_step_deterministic")
+def _dp_gridenv_step_deterministic():
+    return _grid_env_step(True)
+
+@benchmark("dp_gridenv_step_stochastic")
+def _dp_gridenv_step_stochastic():
+    return _grid_env_step(False)
+
+def _gym_gw(**kwargs):
+    from Grid_env import GW
+    env = GW(grid_size=8, num_goals=1, **kwargs)
+    env.reset(seed=0)
+    return env
+
+def _gym_gw_step(**kwargs):
+    env = _gym_gw(**kwargs)
+
+    def run():
+        _, _, terminated, truncated, _ = env.step(int(env.np_random.integers(4)))
+        if terminated or truncated:
+            env.reset()
+    return run
+
+@benchmark("gym_gw_step")
+def _gym_gw_step_plain():
+    return _gym_gw_step()
+
+@benchmark("gym_gw_step_obstacles")
+def _gym_gw_step_obstacles():
+    return _gym_gw_step(num_obstacles=8)
+
+@benchmark("gym_gw_step_moving_obstacles")
+def _gym_gw_step_moving_obstacles():
+    return _gym_gw_step(num_obstacles=8, obstacles_move=True)
+
+@benchmark("gym_gw_reset")
+def _gym_gw_reset():
+    env = _gym_gw()
+    return env.reset
+
+@benchmark("gym_gw_reset_obstacles")
+def _gym_gw_reset_obstacles():
+    env = _gym_gw(num_obstacles=8)
+    return env.reset
+
+# --- DQN agent --------------------------------------------------------------
+
+def _dqn_agent(**kwargs):
+    import tempfile
+    import torch
+    from agents.dqn_agent import DQNAgent
+    torch.set_num_threads(1)
+    model_path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "dqn.pth")
+    return DQNAgent(state_size=4, action_size=4, model_path=model_path, **kwargs)
+
+def _filled_agent(**kwargs):
+    import torch
+    agent = _dqn_agent(**kwargs)
+    for _ in range(1000):
+        state = torch.randint(0, 5, (4,)).float()
+        next_state = torch.randint(0, 5, (4,)).float()
+        agent.remember(state, random.randrange(4), -0.1, next_state, False)
+    return agent
+
+@benchmark("dqn_agent_act_greedy")
+def _dqn_agent_act():
+    import torch
+    agent = _dqn_agent()
+    agent.epsilon = 0.0
+    state = torch.tensor([0.0, 0.0, 3.0, 4.0])
+    return lambda: agent.act(state)
+
+@benchmark("dqn_agent_replay_32")
+def _dqn_agent_replay():
+    agent = _filled_agent()
+    return lambda: agent.replay(32)
+
+@benchmark("dqn_agent_replay_32_prioritized")
+def _dqn_agent_replay_prioritized():
+    agent = _filled_agent(prioritized=True)
+    return lambda: agent.replay(32)
+
+@benchmark("dqn_agent_learn")
+def _dqn_agent_learn():
+    import torch
+    agent = _dqn_agent(use_replay=False)
+    state = torch.tensor([0.0, 0.0, 3.0, 4.0])
+    next_state = torch.tensor([0.0, 1.0, 3.0, 4.0])
+    return lambda: agent.learn(state, 1, -0.1, next_state, False)
+
+# --- Tabular agents and planners --------------------------------------------
+
+@benchmark("tabular_qlearning_update")
+def _qlearning_update():
+    from grid_env import GridEnv
+    from QL_agent import QLearningAgent
+    env = quiet(GridEnv, deterministic=True)
+    agent = QLearningAgent(env)
+    transitions = [((random.randrange(4), random.randrange(4)), random.choice(env.action_space),
+                    -0.1, (random.randrange(4), random.randrange(4)), False) for _ in range(256)]
+    counter = [0]
+
+    def run():
+        counter[0] = (counter[0] + 1) % len(transitions)
+        agent.update(*transitions[counter[0]])
+    return run
+
+def _montecarlo_update(length, **kwargs):
+    from grid_env import GridEnv
+    from MC_agent import MonteCarloAgent
+    env = quiet(GridEnv, deterministic=False)
+    agent = MonteCarloAgent(env, **kwargs)
+    episode = [((random.randrange(4), random.randrange(4)), random.choice(env.action_space), 0.0)
+               for _ in range(length)]
+    return lambda: agent.update(episode)
+
+@benchmark("tabular_montecarlo_update_T50")
+def _montecarlo_update_short():
+    return _montecarlo_update(50)
+
+@benchmark("tabular_montecarlo_update_T5000")
+def _montecarlo_update_long():
+    return _montecarlo_update(5000)
+
+@benchmark("tabular_montecarlo_update_T5000_every_visit")
+def _montecarlo_update_every_visit():
+    return _montecarlo_update(5000, visit="every")
+
+@benchmark("tabular_lockstep_qlearning_K32_E50")
+def _lockstep_qlearning():
+    run_lockstep = dp_util("lockstep").run_lockstep
+    return lambda: run_lockstep("q_learning", num_seeds=32, episodes=50, deterministic=False, seed=0)
+
+def _value_iteration(size, deterministic=True, **kwargs):
+    from grid_env import GridEnv
+    from VI_agent import ValueIterationAgent
+    env = quiet(GridEnv, deterministic=deterministic, grid_size=(size, size))
+    return lambda: quiet(ValueIterationAgent, env, **kwargs)
+
+for _size in (4, 64, 256):
+    benchmark(f"planner_value_iteration_{_size}x{_size}")(
+        lambda size=_size: _value_iteration(size))
+
+@benchmark("planner_value_iteration_prio_256x256")
+def _value_iteration_prioritized():
+    return _value_iteration(256, mode="prioritized")
+
+@benchmark("planner_value_iteration_parallel_512x512")
+def _value_iteration_parallel():
+    from grid_env import GridEnv
+    from ParallelVI_agent import ParallelValueIterationAgent
+    env = quiet(GridEnv, deterministic=True, grid_size=(512, 512))
+    return lambda: quiet(ParallelValueIterationAgent, env)
+
+@benchmark("planner_value_iteration_stochastic_64x64")
+def _value_iteration_stochastic():
+    return _value_iteration(64, deterministic=False)
+
+@benchmark("planner_compile_model_stochastic_64x64")
+def _compile_model():
+    from grid_env import GridEnv
+    from mdp import compile_grid_env
+    env = quiet(GridEnv, deterministic=False, grid_size=(64, 64))
+    return lambda: compile_grid_env(env)
+
+def _policy_iteration(size, evaluation):
+    from grid_env import GridEnv
+    from PI_agent import PolicyIterationAgent
+    env = quiet(GridEnv, deterministic=True, grid_size=(size, size))
+    return lambda: quiet(PolicyIterationAgent, env, evaluation=evaluation)
+
+for _size in (4, 64):
+    for _evaluation in ("exact", "modified"):
+        benchmark(f"planner_policy_iteration_{_evaluation}_{_size}x{_size}")(
+            lambda size=_size, evaluation=_evaluation: _policy_iteration(size, evaluation))
+
+# --- Driver -----------------------------------------------------------------
+
+def run_benchmarks(names, min_time=0.2, repeats=5):
+    """Throughput and calibration ratio of each benchmark, plus the names of those that raised"""
+    results = {}
+    errors = []
+    for name in names:
+        random.seed(0)
+        np.random.seed(0)
+        try:
+            fn = BENCHMARKS[name]()
+            ops, ratio = measure(fn, min_time, repeats)
+        except Exception as e:
+            print(f" {name:40s} ERROR: {e}")
+            errors.append(name)
+            continue
+        results[name] = {"ops_per_s": ops, "ratio": ratio}
+        print(f" {name:40s} {ops:14,.1f} ops/s  {ratio:10.4g} x calibration")
+    return results, errors
+
+def compare(results, baseline, tolerance, names):
+    """Names whose calibration ratio fell more than `tolerance` below the
+    baseline, and baseline names among `names` that produced no result"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if "ratio" not in baseline[name]:
+            raise ValueError(f"Baseline entry {name!r} has no calibration ratio; "
+                             "re-record it with --update-baseline")
+        change = result["ratio"] / baseline[name]["ratio"] - 1
+        status = "REGRESSION" if change < -tolerance else "ok"
+        print(f" {name:40s} {change:+7.1%} vs baseline  {status}")
+        if change < -tolerance:
+            regressions.append(name)
+    # A baseline entry with no result is a benchmark that failed or was removed
+    missing = sorted(name for name in baseline if name in names and name not in results)
+    missing += sorted(name for name in baseline if name not in BENCHMARKS and name not in missing)
+    for name in missing:
+        print(f" {name:40s} {'':>7s} no result      MISSING")
+    return regressions, missing
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="filter", default="", help="only run names containing this")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results.json"))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    # Calibrated ratios still move by up to ~15% between identical runs on a
+    # busy single-core host, so only a clearly larger slowdown is flagged
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown before flagging (default 0.25)")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="timing runs per benchmark, their median is kept (default 5)")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results, errors = run_benchmarks(names, args.min_time, args.repeats)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    if errors:
+        print(f"\n{len(errors)} benchmark(s) failed: {', '.join(errors)}")
+        if args.update_baseline:
+            print("Baseline not updated")
+        return 1
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        baseline = {name: value for name, value in baseline.items() if name in BENCHMARKS}
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print()
+    regressions, missing = compare(results, baseline, args.tolerance, names)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+    if missing:
+        print(f"\n{len(missing)} baseline benchmark(s) without a result: {', '.join(missing)}")
+    return 1 if regressions or missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
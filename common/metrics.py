@@ -0,0 +1,183 @@
+"""Episode metrics shared by DQN and Dynamic Programming, imported through
+each tree's utils/metrics.py.
+"""
+import glob
+import json
+import math
+import os
+import numpy as np
+
+class RollingStats:
+    """Running and windowed mean/std in O(1) per update.
+
+    The running statistics use Welford's algorithm; the window keeps a ring
+    of the last `window` values with running sums, recomputed exactly once
+    per wrap so float drift cannot accumulate.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.values = np.zeros(window, dtype=np.float64)
+        self.index = 0
+        self.filled = 0
+        self.win_sum = 0.0
+        self.win_sumsq = 0.0
+
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x):
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+        old = self.values[self.index]
+        self.values[self.index] = x
+        if self.filled < self.window:
+            self.filled += 1
+            self.win_sum += x
+            self.win_sumsq += x * x
+        else:
+            self.win_sum += x - old
+            self.win_sumsq += x * x - old * old
+        self.index = (self.index + 1) % self.window
+        if self.index == 0:
+            self.win_sum = float(self.values.sum())
+            self.win_sumsq = float(np.dot(self.values, self.values))
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+
+    @property
+    def window_mean(self):
+        return self.win_sum / self.filled if self.filled else 0.0
+
+    @property
+    def window_std(self):
+        if not self.filled:
+            return 0.0
+        mean = self.window_mean
+        return math.sqrt(max(0.0, self.win_sumsq / self.filled - mean * mean))
+
+class MetricsRecorder:
+    """Append-only per-episode metrics log stored as fixed-size .npy chunks.
+
+    Only the current chunk lives in memory, so memory stays flat however many
+    episodes are recorded. Each field also gets a RollingStats for live
+    reporting, and plot() renders the whole log offline with the Agg backend.
+    record() takes exactly the recorder's fields and raises on any other.
+    """
+
+    def __init__(self, path, fields=('reward', 'steps'), chunk_size=10000, window=100):
+        self.path = path
+        self.fields = tuple(fields)
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype([('episode', np.int64)] + [(f, np.float64) for f in self.fields])
+        os.makedirs(path, exist_ok=True)
+
+        meta_path = os.path.join(path, 'meta.json')
+        meta = {'fields': list(self.fields), 'chunk_size': chunk_size}
+        if os.path.exists(meta_path):
+            # Reopening an existing log: its chunks must keep one layout
+            with open(meta_path) as f:
+                stored = json.load(f)
+            if stored != meta:
+                raise ValueError(f"Metrics log at {path} has fields {stored['fields']} and "
+                                 f"chunk_size {stored['chunk_size']}, reopened with "
+                                 f"{meta['fields']} and {chunk_size}")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+
+        self.chunk = np.zeros(chunk_size, dtype=self.dtype)
+        self.chunk_fill = 0
+        self.chunk_id = len(self._chunk_files())
+        self.stats = {f: RollingStats(window) for f in self.fields}
+
+    def _chunk_files(self):
+        return sorted(glob.glob(os.path.join(self.path, 'chunk_*.npy')))
+
+    def record(self, episode, **values):
+        if values.keys() != set(self.fields):
+            unknown = sorted(set(values) - set(self.fields))
+            missing = sorted(set(self.fields) - set(values))
+            raise ValueError(f"MetricsRecorder fields are {self.fields}; "
+                             f"unknown {unknown}, missing {missing}")
+        row = self.chunk[self.chunk_fill]
+        row['episode'] = episode
+        for field in self.fields:
+            value = values[field]
+            row[field] = value
+            self.stats[field].update(value)
+        self.chunk_fill += 1
+        if self.chunk_fill == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as a new chunk file"""
+        if self.chunk_fill == 0:
+            return
+        path = os.path.join(self.path, f'chunk_{self.chunk_id:06d}.npy')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, self.chunk[:self.chunk_fill])
+        os.replace(tmp_path, path)
+        self.chunk_id += 1
+        self.chunk_fill = 0
+
+    def close(self):
+        self.flush()
+
+    def iter_chunks(self):
+        """Recorded rows, one chunk at a time (flushed chunks, then the buffer)"""
+        for path in self._chunk_files():
+            yield np.load(path, mmap_mode='r')
+        if self.chunk_fill:
+            yield self.chunk[:self.chunk_fill]
+
+    def read(self, field, stride=1):
+        """One field over the whole log, optionally keeping every stride-th row"""
+        parts = []
+        offset = 0
+        for chunk in self.iter_chunks():
+            start = (-offset) % stride
+            parts.append(np.array(chunk[field][start::stride]))
+            offset += len(chunk)
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    def plot(self, save_path, field='reward', window=50, max_points=20000, title=None):
+        """Render raw values and a moving average to save_path without any GUI"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        total = sum(len(chunk) for chunk in self.iter_chunks())
+        stride = max(1, total // max_points)
+        episodes = self.read('episode', stride)
+        values = self.read(field, stride)
+
+        fig = Figure(figsize=(10, 5))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        ax.plot(episodes, values, alpha=0.4, label=field)
+        smooth = moving_average(values, max(1, window // stride))
+        if len(smooth):
+            ax.plot(episodes[len(values) - len(smooth):], smooth, label=f'{field} (moyenne mobile)')
+        ax.set_title(title or f'{field} par épisode')
+        ax.set_xlabel('Episode')
+        ax.set_ylabel(field)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
+        return save_path
+
+def moving_average(values, window):
+    """Trailing moving average in O(n) using a cumulative sum"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < window:
+        return np.zeros(0)
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    return (cumsum[window:] - cumsum[:-window]) / window
@@ -0,0 +1,167 @@
+"""Training-loop telemetry shared by DQN (train_experiment, DQNAgent) and
+Dynamic Programming (train_agent), imported through each tree's utils/telemetry.py.
+"""
+import json
+import os
+import resource
+import sys
+import time
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class NullTelemetry:
+    """Disabled telemetry: every hook is a no-op returning shared objects"""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count(self, name, n=1):
+        pass
+
+    def end_episode(self, episode, reward):
+        pass
+
+    def close(self):
+        pass
+
+class _Phase:
+    __slots__ = ('totals', 'calls', 'name', 'start')
+
+    def __init__(self, totals, calls, name):
+        self.totals = totals
+        self.calls = calls
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.totals[self.name] += time.perf_counter() - self.start
+        self.calls[self.name] += 1
+        return False
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class Telemetry:
+    """Per-phase timers and throughput counters for a training loop.
+
+    Wrap each phase in `with telemetry.phase(name):` and call end_episode()
+    once per episode; every `every` episodes one record with the time spent
+    per phase, env steps/s, updates/s and peak RSS is written to `path` as a
+    JSON line (or a CSV row when the path ends in .csv). A phase first timed
+    after the CSV header was written widens it: the file is rewritten with the
+    new columns appended, empty in the earlier rows.
+    """
+
+    enabled = True
+
+    def __init__(self, path, every=100):
+        self.path = path
+        self.every = every
+        self.csv = path.endswith('.csv')
+        self.header = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'a')
+
+        self.totals = {}
+        self.calls = {}
+        self.phases = {}
+        self.counters = {}
+        self.rewards = []
+        self.window_start = time.perf_counter()
+
+    def phase(self, name):
+        phase = self.phases.get(name)
+        if phase is None:
+            self.totals[name] = 0.0
+            self.calls[name] = 0
+            phase = self.phases[name] = _Phase(self.totals, self.calls, name)
+        return phase
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def end_episode(self, episode, reward):
+        self.rewards.append(reward)
+        if (episode + 1) % self.every == 0:
+            self.emit(episode)
+
+    def emit(self, episode):
+        elapsed = time.perf_counter() - self.window_start
+        record = {
+            'episode': episode,
+            'elapsed_s': elapsed,
+            'mean_reward': sum(self.rewards) / len(self.rewards) if self.rewards else 0.0,
+            'env_steps_per_s': self.counters.get('env_steps', 0) / elapsed,
+            'updates_per_s': self.counters.get('updates', 0) / elapsed,
+            'peak_rss_mb': peak_rss_mb()
+        }
+        for name in sorted(self.totals):
+            record[f'{name}_s'] = self.totals[name]
+            record[f'{name}_calls'] = self.calls[name]
+        self._write(record)
+
+        # Start a new window
+        for name in self.totals:
+            self.totals[name] = 0.0
+            self.calls[name] = 0
+        self.counters.clear()
+        self.rewards.clear()
+        self.window_start = time.perf_counter()
+
+    def _write(self, record):
+        if self.csv:
+            if self.header is None:
+                self.header = self._read_header()
+                if not self.header:
+                    self.header = list(record)
+                    self.file.write(','.join(self.header) + '\n')
+            new = [k for k in record if k not in self.header]
+            if new:
+                self._widen_header(new)
+            self.file.write(','.join(str(record.get(k, '')) for k in self.header) + '\n')
+        else:
+            self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def _read_header(self):
+        """Columns of the CSV file we append to, [] if it is empty"""
+        if self.file.tell() == 0:
+            return []
+        with open(self.path) as f:
+            return f.readline().rstrip('\n').split(',')
+
+    def _widen_header(self, new):
+        """Rewrite the CSV with `new` columns appended, left empty in earlier rows"""
+        self.file.close()
+        with open(self.path) as f:
+            rows = f.read().splitlines()[1:]
+        self.header += new
+        padding = ',' * len(new)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(','.join(self.header) + '\n')
+            for row in rows:
+                f.write(row + padding + '\n')
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, 'a')
+
+    def close(self):
+        self.file.close()